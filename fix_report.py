@@ -1,47 +1,147 @@
 #!/usr/bin/env python3
-import re
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import sys
 
-def clean_escape_sequences(content):
-    """Enhanced cleaning of ANSI escape sequences"""
-    # First, handle text representations of ESC
-    esc_pattern = re.compile(r'ESC\[(\d+;)*\d*[a-zA-Z]|ESC\[\d+m|ESC\[0m|ESC\[1m|ESC\[4m|ESC\[\d+;\d+m')
-    content = esc_pattern.sub('', content)
-    
-    # Then handle actual ANSI escape sequences
-    ansi_pattern = re.compile(r'\x1B\[(\d+;)*\d*[a-zA-Z]|\x1B\[\d+m|\x1B\[0m|\x1B\[1m|\x1B\[4m|\x1B\[\d+;\d+m')
-    content = ansi_pattern.sub('', content)
-    
-    # More comprehensive pattern for any remaining escapes
-    full_pattern = re.compile(r'(?:\x1B|\bESC)(?:\[|\(|\))[^@-Z\\^_`a-z{|}~]*[@-Z\\^_`a-z{|}~]')
-    content = full_pattern.sub('', content)
-    
-    return content
+from market_research_cli.escape_sequences import _COMBINED_BYTES, _RAW_ESC_BYTES, clean_escape_sequences
 
-def fix_report_file(report_path):
-    """Clean a report file and save it back with escape sequences removed"""
+# Reports larger than this are cleaned block by block instead of being loaded whole
+_STREAM_THRESHOLD = 16 << 20
+_CHUNK_SIZE = 1 << 20
+# Buffer for report writes, well above io.DEFAULT_BUFFER_SIZE (8 KiB)
+_IO_BUFFER_SIZE = 1 << 18
+# Final bytes of an escape sequence (the complement of its parameter class in escape_sequences._ESC_BODY)
+_FINAL_BYTES = frozenset(range(0x40, 0x5B)) | {0x5C} | frozenset(range(0x5E, 0x7F))
+
+def _write_atomic(path, data):
+    """Replace path with data via a sibling temp file and a rename"""
+    tmp = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def _split_point(buf, start):
+    """Return an offset in buf that does not fall inside a trailing escape sequence"""
+    # Parameters are unbounded, so a sequence is only complete once a final byte
+    # follows it; find where the trailing run of non-final bytes begins
+    tail = len(buf)
+    while tail > start and buf[tail - 1] not in _FINAL_BYTES:
+        tail -= 1
+    # A prefix in that run (or "ESC" whose C is the last final byte) has no end yet
+    window = max(start, tail - 3)
+    starts = [i for i in (buf.find(b'\x1b', window), buf.find(b'ESC', window)) if i != -1]
+    # Without a prefix in the tail, still hold back a possibly partial "ES"
+    return min(starts) if starts else max(start, len(buf) - 2)
+
+def _clean_block(buf, start, final):
+    """Strip escape sequences from buf[start:], returning (cleaned, resume_offset)
+
+    Bytes before start are context only, so \\bESC sees its real neighbour. Unless
+    this is the final block, stop at a split point and leave the tail for the next one.
+    """
+    cut = len(buf) if final else _split_point(buf, start)
+    pattern = _COMBINED_BYTES if buf.find(b'ESC', start) != -1 else _RAW_ESC_BYTES
+    out = []
+    pos = start
+    # Slice through a memoryview so the kept spans are not copied before the join
+    with memoryview(buf) as view:
+        for match in pattern.finditer(view, start):
+            if match.start() >= cut:
+                break
+            out.append(view[pos:match.start()])
+            pos = match.end()
+        end = max(pos, cut)
+        out.append(view[pos:end])
+        cleaned = b''.join(out).translate(None, b'\x1b')
+        for span in out:
+            span.release()
+    return cleaned, end
+
+def _clean_file_streaming(path):
+    """Clean a large report in fixed-size blocks and atomically replace it
+
+    Returns False (and leaves the original untouched) if nothing was removed.
+    """
+    tmp = path.with_name(path.name + '.tmp')
+    changed = False
+    try:
+        with open(path, 'rb', buffering=_CHUNK_SIZE) as src, open(tmp, 'wb', buffering=_IO_BUFFER_SIZE) as dst:
+            buf = bytearray()
+            start = 0
+            while True:
+                block = src.read(_CHUNK_SIZE)
+                buf += block
+                cleaned, end = _clean_block(buf, start, final=not block)
+                dst.write(cleaned)
+                changed = changed or len(cleaned) != end - start
+                if not block:
+                    break
+                # Keep the unprocessed tail plus one byte of context; deleting from
+                # the front of a bytearray just moves its start pointer
+                start = 1 if end else 0
+                del buf[:end - start]
+        if changed:
+            os.replace(tmp, path)
+        else:
+            tmp.unlink()
+        return changed
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def _fix_report(report_path):
+    """Clean a report file in place, returning (ok, log line) instead of printing"""
     path = Path(report_path)
     if not path.exists():
-        print(f"Error: Report file not found at {report_path}")
-        return False
+        return False, f"Error: Report file not found at {report_path}"
     
     try:
-        # Read the file
-        content = path.read_text(encoding='utf-8')
+        # Scan the page-cache mapping for an escape prefix before copying anything;
+        # clean files are never materialised or rewritten
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:  # mmap cannot map an empty file
+                return True, f"No escape sequences found in: {report_path}"
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b'\x1b') == -1 and mm.find(b'ESC') == -1:
+                    return True, f"No escape sequences found in: {report_path}"
+                content = mm[:] if size <= _STREAM_THRESHOLD else None
         
-        # Clean the content
-        cleaned_content = clean_escape_sequences(content)
+        if content is None:
+            # Large file: keep memory bounded by cleaning it in blocks
+            changed = _clean_file_streaming(path)
+        else:
+            # Clean the content
+            cleaned_content = clean_escape_sequences(content)
+            
+            # A stray "ESC" in prose passes the pre-scan without anything to strip;
+            # leave such files (and their mtime) alone
+            changed = cleaned_content != content
+            if changed:
+                # Save the cleaned content back to the file; readers see either
+                # the old report or the new one, never a truncated file
+                _write_atomic(path, cleaned_content)
         
-        # Save the cleaned content back to the file
-        path.write_text(cleaned_content, encoding='utf-8')
+        if not changed:
+            return True, f"No escape sequences found in: {report_path}"
         
-        print(f"Successfully cleaned escape sequences in: {report_path}")
-        return True
+        return True, f"Successfully cleaned escape sequences in: {report_path}"
         
     except Exception as e:
-        print(f"Error processing file {report_path}: {e}")
-        return False
+        return False, f"Error processing file {report_path}: {e}"
+
+def fix_report_file(report_path):
+    """Clean a report file and save it back with escape sequences removed"""
+    ok, message = _fix_report(report_path)
+    print(message)
+    return ok
 
 def process_all_reports():
     """Process all .md files in the reports directory"""
@@ -50,17 +150,34 @@ def process_all_reports():
         print("Error: Reports directory not found.")
         return
     
-    success_count = 0
-    fail_count = 0
+    # One scandir pass yields names, cached file types and inode numbers without a
+    # stat per entry; visiting files in inode order keeps disk reads mostly sequential
+    with os.scandir(reports_dir) as it:
+        entries = sorted((entry.inode(), entry.path) for entry in it
+                         if entry.name.endswith(".md") and entry.is_file())
+    report_paths = [path for _, path in entries]
     
-    for report_file in reports_dir.glob("*.md"):
-        print(f"Processing: {report_file.name}")
-        if fix_report_file(report_file):
-            success_count += 1
-        else:
-            fail_count += 1
+    # Files are independent of each other, so clean them on all cores. Handing out
+    # runs of neighbouring paths gives each worker a contiguous inode range while
+    # leaving a few runs per worker for load balancing
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(report_paths) // (workers * 4))
+    # Forked workers inherit the compiled patterns copy-on-write; under spawn (the
+    # default on macOS/Windows and on Linux from 3.14) each worker would re-import
+    # this module and recompile them. This script starts no threads, so fork is safe
+    mp_context = None
+    if 'fork' in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context('fork')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        results = list(executor.map(_fix_report, report_paths, chunksize=chunksize))
+    
+    success_count = sum(ok for ok, _ in results)
+    fail_count = len(results) - success_count
     
-    print(f"\nProcessing complete. Successfully processed {success_count} files. Failed: {fail_count}")
+    # Emit the per-file log in one write rather than one syscall per line
+    log_lines = [message for _, message in results]
+    log_lines.append(f"\nProcessing complete. Successfully processed {success_count} files. Failed: {fail_count}\n")
+    sys.stdout.write("\n".join(log_lines))
 
 # Main execution
 if __name__ == "__main__":
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Escape sequence cleaning shared by the CLI, the core module and fix_report.py."""
+
+import re
+
+# Escape sequence recogniser: a fixed-width prefix (raw \x1B, or the literal text
+# "ESC" as printed by some terminals) with its introducer, then parameter bytes and
+# one final byte. The parameter and final classes are complements of each other, so
+# every character has exactly one transition and the engine never backtracks inside
+# a candidate match (the old (\d+;)*\d* nesting did).
+_ESC_BODY = r'[^@-Z\\^_`a-z{|}~]*[@-Z\\^_`a-z{|}~]'
+_ESC_PATTERN = r'(?:\x1B[\[()]|ESC\[|\bESC[()])' + _ESC_BODY
+# Most reports only contain raw escapes; a pattern with a single literal first
+# character lets the engine skip ahead to each \x1B instead of trying the
+# alternation at every position
+_RAW_ESC_PATTERN = r'\x1B[\[()]' + _ESC_BODY
+_COMBINED = re.compile(_ESC_PATTERN)
+_RAW_ESC = re.compile(_RAW_ESC_PATTERN)
+# Escape sequences are pure ASCII, so files can be cleaned without a decode/encode round-trip
+_COMBINED_BYTES = re.compile(_ESC_PATTERN.encode('ascii'))
+_RAW_ESC_BYTES = re.compile(_RAW_ESC_PATTERN.encode('ascii'))
+
+# Bare ESC bytes left over after the sequences are gone are dropped with translate,
+# a plain C scan, rather than by widening the regex
+_DROP_ESC = {0x1B: None}
+
+def clean_escape_sequences(content):
+    """Enhanced cleaning of ANSI escape sequences (accepts str or bytes)"""
+    if isinstance(content, (bytes, bytearray)):
+        pattern = _COMBINED_BYTES if b'ESC' in content else _RAW_ESC_BYTES
+        return pattern.sub(b'', content).translate(None, b'\x1b')
+    pattern = _COMBINED if 'ESC' in content else _RAW_ESC
+    return pattern.sub('', content).translate(_DROP_ESC)
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 import os
+import asyncio
 import json
 import time
 import random
-import threading
-from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Union, Any, Callable
+from dataclasses import dataclass
+from enum import Enum
+from collections import namedtuple, deque
 from pathlib import Path
 import re
 import subprocess
@@ -13,27 +15,25 @@ import tempfile
 import shutil
 import platform
 import sys
+import importlib.util
+import itertools
+import threading
+import functools
 
 # Load environment variables first
 from dotenv import load_dotenv
 load_dotenv()
 
-# Rich library for console UI
+# Rich library for console UI; the live dashboard widgets are imported in generate_report
 import questionary
 from rich.console import Console
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeElapsedColumn
-from rich.panel import Panel
-from rich import print as rprint
-from rich.markdown import Markdown
-from rich.live import Live
-from rich.layout import Layout
 from rich.text import Text
 from rich.align import Align
-import typer
+from rich.traceback import Traceback
 
-# OpenAI API
-from openai import OpenAI
+# Pure-Python escape sequence cleaner, used when the native one is unavailable or fails
+from escape_sequences import clean_escape_sequences as _strip_escape_sequences
 
 # Add the web_search module import
 try:
@@ -42,6 +42,14 @@ try:
 except ImportError:
     WEB_SEARCH_AVAILABLE = False
 
+# Persistent cache for generated sections
+try:
+    from response_cache import ResponseCache, make_cache_key, SemanticCache, SEMANTIC_CACHE_AVAILABLE
+    RESPONSE_CACHE_AVAILABLE = True
+except ImportError:
+    RESPONSE_CACHE_AVAILABLE = False
+    SEMANTIC_CACHE_AVAILABLE = False
+
 # Import our Rust-accelerated core module
 try:
     from market_research_core_py import (
@@ -65,12 +73,15 @@ except ImportError:
         # If we can't import directly, we'll define them below
         pass
 
-# Import Twilio if available
+# Backoff for transient API failures; without tenacity each call relies on the SDK's own retries
 try:
-    from twilio.rest import Client as TwilioClient
-    TWILIO_AVAILABLE = True
+    from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+    TENACITY_AVAILABLE = True
 except ImportError:
-    TWILIO_AVAILABLE = False
+    TENACITY_AVAILABLE = False
+
+# Check for Twilio without importing it; the client is imported when an SMS is sent
+TWILIO_AVAILABLE = importlib.util.find_spec("twilio") is not None
 
 # Initialize Rich console
 console = Console()
@@ -92,6 +103,16 @@ class ConfigurationError(Exception):
     """Indicates an error due to missing configuration (e.g., API keys, libraries)."""
     pass
 
+class TransientReportError(ModelGenerationError):
+    """Indicates a report failed only on transient API errors, so regenerating it may succeed.
+
+    search_results holds the attempt's (topic results, per-stage results), so a retry
+    can skip the web search.
+    """
+    def __init__(self, message: str, search_results):
+        super().__init__(message)
+        self.search_results = search_results
+
 # Set up OpenAI API key from environment
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -101,14 +122,102 @@ if not OPENAI_API_KEY:
 else:
     console.print("[green]✓ OpenAI API key found[/green]")
 
+# Claude model used for every section
+CLAUDE_MODEL = "claude-3-opus-20240229"
+
+# OpenAI model used for every section; override with OPENAI_MODEL in .env
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+# The CLI only takes on/off flags, so they are read straight from argv
+CLI_FLAGS = frozenset(arg for arg in sys.argv[1:] if arg.startswith("--"))
+# Pass --batch to default OpenAI-only runs to the (cheaper, slower) Batch API
+OPENAI_BATCH_DEFAULT = "--batch" in CLI_FLAGS
+# Pass --single-call to generate all sections in one request instead of one per stage
+SINGLE_CALL_MODE = "--single-call" in CLI_FLAGS
+# Pass --stage-search to run a focused web search per stage on top of the topic search
+STAGE_SEARCH_MODE = "--stage-search" in CLI_FLAGS
+# Seconds between Batch API status checks (backs off up to the maximum)
+BATCH_POLL_INITIAL = 5
+BATCH_POLL_MAX = 60
+
+# The OpenAI and Claude clients share one HTTP connection pool. With the h2 package
+# installed it speaks HTTP/2, so concurrent section requests to a provider are
+# multiplexed over a single TLS connection.
+HTTP_MAX_CONNECTIONS = 16
+shared_http_client = None
+
+def get_shared_http_client():
+    """Return the shared httpx.AsyncClient, creating it on first use (None without httpx)."""
+    global shared_http_client
+    if shared_http_client is None:
+        try:
+            import httpx
+        except ImportError:
+            return None
+        shared_http_client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS),
+            timeout=60.0,
+        )
+    return shared_http_client
+
+
+def close_shared_http_client() -> None:
+    """Close the shared connection pool (call once, on exit)."""
+    global shared_http_client
+    if shared_http_client is not None:
+        _run_async(shared_http_client.aclose())
+        shared_http_client = None
+
+# One shared client keeps its connection pool (and TLS sessions) across section calls.
+# The openai library is only imported when the client is first needed.
+openai_client = None
+
+def get_openai_client():
+    """Return the shared async OpenAI client, creating it on first use (None if unavailable)."""
+    global openai_client
+    if openai_client is None and OPENAI_API_KEY:
+        try:
+            from openai import AsyncOpenAI
+            openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY, timeout=60.0, max_retries=2,
+                                        http_client=get_shared_http_client())
+        except ImportError:
+            console.print("[yellow]⚠ OpenAI library ('openai') not installed. OpenAI models unavailable.[/yellow]")
+        except Exception as e:
+            console.print(f"[yellow]⚠ Error initializing OpenAI client: {str(e)}[/yellow]")
+    return openai_client
+
 # Initialize Claude client variables
 CLAUDE_AVAILABLE = False
 CLAUDE_MESSAGES_API_AVAILABLE = False
 claude_client = None
+claude_async_client = None
 CLAUDE_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+# The anthropic library is imported on first use (see ensure_claude_client), so
+# startup only checks whether it is installed
+CLAUDE_LIBRARY_INSTALLED = importlib.util.find_spec("anthropic") is not None
+_claude_init_attempted = False
+# Set once by ensure_claude_client: library imported, both clients built, Messages API present
+CLAUDE_READY = False
+
+if not CLAUDE_API_KEY:
+    console.print("[yellow]⚠ Claude API key not found in environment variables. Claude models unavailable.[/yellow]")
+elif not CLAUDE_LIBRARY_INSTALLED:
+    console.print("[yellow]⚠ Claude API library ('anthropic') not installed. Claude models unavailable.[/yellow]")
+
+
+def ensure_claude_client() -> bool:
+    """Import anthropic and initialize the Claude clients on first use.
+    Returns True if Claude's Messages API is usable."""
+    global anthropic, CLAUDE_AVAILABLE, CLAUDE_MESSAGES_API_AVAILABLE, CLAUDE_READY, claude_client, claude_async_client, _claude_init_attempted
+    if _claude_init_attempted:
+        return CLAUDE_READY
+    _claude_init_attempted = True
+    CLAUDE_READY = False
+    if not CLAUDE_API_KEY:
+        return False
 
-# Try to import and initialize Anthropic's Claude API
-if CLAUDE_API_KEY:
+    # Try to import and initialize Anthropic's Claude API
     try:
         import anthropic
 
@@ -117,10 +226,10 @@ if CLAUDE_API_KEY:
             # Modern client initialization
             try:
                 # Try to handle different versions of anthropic library
-                import pkg_resources
-                anthropic_version = pkg_resources.get_distribution("anthropic").version
+                from importlib.metadata import version as package_version, PackageNotFoundError
+                anthropic_version = package_version("anthropic")
                 console.print(f"[cyan]Detected anthropic library version: {anthropic_version}[/cyan]")
-                
+            
                 # Initialize client
                 try:
                     claude_client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
@@ -137,12 +246,14 @@ if CLAUDE_API_KEY:
                         claude_client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
                     else:
                         raise  # Re-raise if it's a different TypeError
-            except (pkg_resources.DistributionNotFound, ImportError, Exception) as e:
+            except (PackageNotFoundError, ImportError, Exception) as e:
                 # If we can't check version, try direct initialization
                 console.print(f"[yellow]Couldn't determine anthropic version: {str(e)}. Trying direct initialization...[/yellow]")
                 claude_client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
-                        
+                    
             CLAUDE_AVAILABLE = True
+            # Shared async client used for section generation
+            claude_async_client = anthropic.AsyncAnthropic(api_key=CLAUDE_API_KEY, http_client=get_shared_http_client())
 
             # Check if Messages API is available (primary method)
             if hasattr(claude_client, "messages") and callable(getattr(claude_client.messages, "create", None)):
@@ -155,30 +266,111 @@ if CLAUDE_API_KEY:
             CLAUDE_AVAILABLE = False
     except ImportError:
         console.print("[yellow]⚠ Claude API library ('anthropic') not installed. Claude models unavailable.[/yellow]")
-else:
-    console.print("[yellow]⚠ Claude API key not found in environment variables. Claude models unavailable.[/yellow]")
+    CLAUDE_READY = CLAUDE_AVAILABLE and CLAUDE_MESSAGES_API_AVAILABLE and claude_client is not None and claude_async_client is not None
+    return CLAUDE_READY
+
 
+# Directories already created by this process, so saves don't repeat the mkdir
+_ensured_dirs = set()
+
+def _ensure_dir(path: Union[str, Path]) -> None:
+    """Create a directory (and parents) at most once per process."""
+    key = os.fspath(path)
+    if key not in _ensured_dirs:
+        os.makedirs(key, exist_ok=True)
+        _ensured_dirs.add(key)
 
 # Constants
 REPORTS_DIR = Path("reports")
-REPORTS_DIR.mkdir(exist_ok=True)
+ENV_FILE = Path(".env")
+_ensure_dir(REPORTS_DIR)
+# Characters replaced with "_" when a topic becomes part of a report filename
+_FILENAME_TABLE = str.maketrans({" ": "_", "/": "_", "\\": "_", ":": "_"})
+
+# Re-running a topic with the same sources reuses earlier sections instead of paying
+# for identical API calls again. Pass --no-cache to always call the models.
+response_cache = None
+if RESPONSE_CACHE_AVAILABLE and "--no-cache" not in CLI_FLAGS:
+    try:
+        response_cache = ResponseCache(REPORTS_DIR / ".cache")
+    except Exception as e:
+        console.print(f"[yellow]⚠ Response cache unavailable: {str(e)}[/yellow]")
 
-# Initialize our Rust-accelerated report manager (if available)
-# Default to a basic implementation if Rust core is not available
-if is_rust_enabled:
-    report_manager = ReportManager(str(REPORTS_DIR))
-else:
+# Near-duplicate topics ("AI chip" vs "AI semiconductor") reuse sections through a
+# similarity match on topic embeddings, checked after the exact-match cache misses.
+# SEMANTIC_CACHE_THRESHOLD in .env tunes how close a topic must be to count as a hit.
+try:
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    if not 0 < SEMANTIC_CACHE_THRESHOLD <= 1:
+        raise ValueError(SEMANTIC_CACHE_THRESHOLD)
+except ValueError:
+    console.print("[yellow]⚠ SEMANTIC_CACHE_THRESHOLD must be a number above 0 and at most 1; using 0.92.[/yellow]")
+    SEMANTIC_CACHE_THRESHOLD = 0.92
+semantic_cache = None
+if SEMANTIC_CACHE_AVAILABLE and response_cache is not None:
+    try:
+        semantic_cache = SemanticCache(response_cache, SEMANTIC_CACHE_THRESHOLD)
+    except Exception as e:
+        console.print(f"[yellow]⚠ Semantic cache unavailable: {str(e)}[/yellow]")
+
+# Embedding backends for the semantic cache: a local model if sentence-transformers
+# is installed, otherwise the OpenAI embeddings endpoint
+SEMANTIC_LOCAL_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
+
+# The report manager is Rust-accelerated if available, with a basic implementation
+# otherwise; either way it is created on first use (see get_report_manager)
+if not is_rust_enabled:
     # Basic Python fallback for ReportManager functionality
     class BasicReportManager:
+        INDEX_FILE = ".index.jsonl"
+
         def __init__(self, directory):
             self.dir = Path(directory)
-            self.dir.mkdir(exist_ok=True)
+            _ensure_dir(self.dir)
+            # Absolute directory as a string, so saves build their path with one format
+            self._root_str = os.fspath(self.dir.resolve())
+            # filename -> {"title", "date", "id"}, so listings don't reopen every report
+            self.index_path = self.dir / self.INDEX_FILE
+            self.index = self._load_index()
+
+        def _load_index(self):
+            """Load the metadata index; later lines override earlier ones"""
+            index = {}
+            try:
+                with open(self.index_path, encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                            index[entry["filename"]] = {k: entry.get(k) for k in ("title", "date", "id")}
+                        except (ValueError, KeyError, TypeError):
+                            continue # Skip a torn or hand-edited line
+            except OSError:
+                pass
+            return index
+
+        def _append_index(self, entries):
+            with open(self.index_path, "a", encoding='utf-8') as f:
+                for filename, metadata in entries:
+                    f.write(json.dumps({"filename": filename, **metadata}) + "\n")
+                f.flush()
+
+        def _rewrite_index(self):
+            tmp_path = self.index_path.with_name(self.INDEX_FILE + ".tmp")
+            with open(tmp_path, "w", encoding='utf-8') as f:
+                for filename, metadata in self.index.items():
+                    f.write(json.dumps({"filename": filename, **metadata}) + "\n")
+            os.replace(tmp_path, self.index_path)
+
+        @staticmethod
+        def _metadata_for(content):
+            metadata = parse_report_metadata(content)
+            if isinstance(metadata, tuple):
+                metadata = metadata[0]
+            return {k: str(metadata.get(k, "")) for k in ("title", "date", "id")}
 
         def save_report(self, filename, content):
             """Save a report to disk"""
-            path = self.dir / filename
-            path.parent.mkdir(parents=True, exist_ok=True)
-            
             # Clean any ANSI escape sequences that might be in the content
             try:
                 # Always use the Python wrapper which has proper fallback handling
@@ -186,23 +378,34 @@ else:
             except Exception as e:
                 print(f"Warning: Could not use clean_escape_sequences: {e}. Using direct regex.")
                 try:
-                    # Handle text representations of ESC
-                    import re
-                    esc_pattern = re.compile(r'ESC\[(\d+;)*\d*[a-zA-Z]|ESC\[\d+m|ESC\[0m|ESC\[1m|ESC\[4m|ESC\[\d+;\d+m')
-                    content = esc_pattern.sub('', content)
-                    
-                    # Handle actual ANSI escape sequences
-                    ansi_pattern = re.compile(r'\x1B\[(\d+;)*\d*[a-zA-Z]|\x1B\[\d+m|\x1B\[0m|\x1B\[1m|\x1B\[4m|\x1B\[\d+;\d+m')
-                    content = ansi_pattern.sub('', content)
-                    
-                    # Comprehensive pattern as final cleanup
-                    escape_seq_pattern = re.compile(r'(?:\x1B|\bESC)(?:\[|\(|\))[^@-Z\\^_`a-z{|}~]*[@-Z\\^_`a-z{|}~]')
-                    content = escape_seq_pattern.sub('', content)
+                    content = _strip_escape_sequences(content)
                 except Exception as inner_e:
                     print(f"Warning: Could not clean escape sequences: {inner_e}")
                 
-            path.write_text(content, encoding='utf-8')
-            return str(path)
+            return self.save_report_bytes(filename, content.encode('utf-8'))
+
+        def save_report_bytes(self, filename, data):
+            """Save an already-cleaned, UTF-8 encoded report to disk"""
+            path = f"{self._root_str}{os.sep}{filename}"
+            _ensure_dir(os.path.dirname(path))
+            # Write the encoded report straight to the file descriptor (no text layer or
+            # buffer copy), synced before it is indexed
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            try:
+                # The metadata block is at the top, so only decode the start of the report
+                metadata = self._metadata_for(data[:8192].decode('utf-8', errors='ignore'))
+                self.index[filename] = metadata
+                self._append_index([(filename, metadata)])
+            except Exception as e:
+                print(f"Warning: Could not update report index: {e}")
+            return path
 
         def read_report(self, filename):
             path = self.dir / filename
@@ -214,91 +417,94 @@ else:
             path = self.dir / filename
             if path.exists():
                 path.unlink()
+                if self.index.pop(filename, None) is not None:
+                    self._rewrite_index()
                 return True
             return False
 
+        def get_report_metadata(self, filename):
+            """Return indexed metadata for a report, or None if it isn't indexed"""
+            return self.index.get(filename)
+
         def get_all_reports(self):
-            return sorted([f.name for f in self.dir.glob("*.md")])
+            """List reports newest first, indexing any added outside save_report"""
+            with os.scandir(self.dir) as entries:
+                names = {e.name for e in entries if e.name.endswith(".md") and e.is_file()}
+
+            missing = []
+            for name in names.difference(self.index):
+                try:
+                    metadata = self._metadata_for(_read_report_header(self.dir / name))
+                except Exception:
+                    continue # Listed anyway; the caller reports the parse failure
+                self.index[name] = metadata
+                missing.append((name, metadata))
+
+            stale = [name for name in self.index if name not in names]
+            for name in stale:
+                del self.index[name]
+            try:
+                if stale:
+                    self._rewrite_index()
+                elif missing:
+                    self._append_index(missing)
+            except OSError as e:
+                print(f"Warning: Could not update report index: {e}")
 
-    report_manager = BasicReportManager(str(REPORTS_DIR))
+            return sorted(names, key=lambda name: ((self.index.get(name) or {}).get("date") or "", name), reverse=True)
 
     # Basic Python fallback for other Rust functions (if needed)
+    # Sequence number within this process; with the timestamp it keeps report IDs
+    # unique when several reports are formatted in the same second
+    _REPORT_COUNTER = itertools.count(1)
+    _HEADER_TEMPLATE = "---\nid: {id}\ntitle: {title} Market Analysis\ndate: {ts}\n---\n\n# {title} Market Analysis\nGenerated on: {ts}\n\n"
+
     def format_report(content, title):
         """Basic Python implementation for formatting report header."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        report_id = f"REP-{random.randint(1000, 9999)}" # Simple ID
-        header = f"""---
-id: {report_id}
-title: {title} Market Analysis
-date: {timestamp}
----
-
-# {title} Market Analysis
-Generated on: {timestamp}
-
-"""
+        now = time.localtime()
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", now)
+        report_id = f"REP-{time.strftime('%Y%m%d-%H%M%S', now)}-{next(_REPORT_COUNTER):04d}"
+        header = _HEADER_TEMPLATE.format(id=report_id, title=title, ts=timestamp)
         # Clean any ANSI escape sequences that might be in the content
         try:
             # Try to use the Python wrapper function first
             content = clean_escape_sequences(content)
         except Exception as e:
             # Fallback if function not available
-            escape_seq_pattern = re.compile(r'(?:\x1B|\bESC)(?:\[|\(|\))[^@-Z\\^_`a-z{|}~]*[@-Z\\^_`a-z{|}~]')
-            content = escape_seq_pattern.sub('', content)
+            content = _strip_escape_sequences(content)
             
         return header + content
 
     # Fallback for PDF export if not imported
     if 'export_to_pdf' not in globals():
-        # Check if ReportLab is available
-        REPORTLAB_AVAILABLE = False
-        try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.lib import colors
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-            from reportlab.lib.units import inch, cm
-            REPORTLAB_AVAILABLE = True
-        except ImportError:
-            REPORTLAB_AVAILABLE = False
+        # Check if ReportLab is installed; it is only imported when a PDF is built with it
+        REPORTLAB_AVAILABLE = importlib.util.find_spec("reportlab") is not None
         
-        def export_to_pdf(content, output_path):
-            """Python fallback for PDF export if the imported version is not available"""
-            # Clean any escape sequences
-            escape_seq_pattern = re.compile(r'(?:\x1B|\bESC)(?:\[|\(|\))[^@-Z\\^_`a-z{|}~]*[@-Z\\^_`a-z{|}~]')
-            cleaned_content = escape_seq_pattern.sub('', content)
-            
-            # Check if wkhtmltopdf is available
-            wkhtmltopdf_available = False
+        @functools.lru_cache(maxsize=1)
+        def _weasyprint_html():
+            """Return WeasyPrint's HTML class, or None if it (or the Pango it needs) cannot be loaded"""
             try:
-                subprocess.run(['wkhtmltopdf', '--version'], 
-                              check=True, 
-                              stdout=subprocess.PIPE, 
-                              stderr=subprocess.PIPE)
-                wkhtmltopdf_available = True
-            except (subprocess.SubprocessError, FileNotFoundError):
-                wkhtmltopdf_available = False
+                from weasyprint import HTML
+                return HTML
+            except (ImportError, OSError):
+                return None
+        
+        def _markdown_to_html_document(cleaned_content):
+            """Render report markdown as a styled standalone HTML document for PDF conversion"""
+            # Convert markdown to HTML
+            try:
+                import markdown
+                html_content = markdown.markdown(
+                    cleaned_content, 
+                    extensions=['tables', 'fenced_code']
+                )
+            except ImportError:
+                # Basic fallback if markdown module not available
+                html_content = cleaned_content.replace('\n', '<br>')
+                html_content = f"<pre>{html_content}</pre>"
             
-            # If wkhtmltopdf is available, use it (better quality)
-            if wkhtmltopdf_available:
-                # Create temp HTML file
-                with tempfile.NamedTemporaryFile(suffix='.html', delete=False, mode='w', encoding='utf-8') as f:
-                    temp_html_path = f.name
-                    
-                    # Convert markdown to HTML
-                    try:
-                        import markdown
-                        html_content = markdown.markdown(
-                            cleaned_content, 
-                            extensions=['tables', 'fenced_code']
-                        )
-                    except ImportError:
-                        # Basic fallback if markdown module not available
-                        html_content = cleaned_content.replace('\n', '<br>')
-                        html_content = f"<pre>{html_content}</pre>"
-                    
-                    # Add CSS styling
-                    full_html = f"""<!DOCTYPE html>
+            # Add CSS styling
+            full_html = f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -317,6 +523,32 @@ Generated on: {timestamp}
     {html_content}
 </body>
 </html>"""
+            return full_html
+        
+        def export_to_pdf(content, output_path):
+            """Python fallback for PDF export if the imported version is not available"""
+            # Clean any escape sequences
+            cleaned_content = _strip_escape_sequences(content)
+            
+            # Check if wkhtmltopdf is on PATH (a lookup, rather than spawning it to print its version)
+            wkhtmltopdf_available = shutil.which('wkhtmltopdf') is not None
+            
+            # Prefer an in-process renderer, then wkhtmltopdf (better quality than ReportLab)
+            weasy_html = _weasyprint_html()
+            if weasy_html is not None or wkhtmltopdf_available:
+                full_html = _markdown_to_html_document(cleaned_content)
+            
+            if weasy_html is not None:
+                # Renders without a temp file or a wkhtmltopdf process launch per export
+                try:
+                    weasy_html(string=full_html, base_url='.').write_pdf(output_path)
+                except Exception as e:
+                    raise RuntimeError(f"Failed to convert to PDF: {e}")
+            
+            elif wkhtmltopdf_available:
+                # Create temp HTML file
+                with tempfile.NamedTemporaryFile(suffix='.html', delete=False, mode='w', encoding='utf-8') as f:
+                    temp_html_path = f.name
                     f.write(full_html)
                 
                 # Convert HTML to PDF
@@ -339,6 +571,10 @@ Generated on: {timestamp}
             # If wkhtmltopdf not available but reportlab is, use it
             elif REPORTLAB_AVAILABLE:
                 print("Using ReportLab for PDF generation (wkhtmltopdf not found)")
+                from reportlab.lib.pagesizes import A4
+                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+                from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+                from reportlab.lib.units import inch, cm
                 
                 # Extract metadata and title
                 metadata = {}
@@ -348,13 +584,11 @@ Generated on: {timestamp}
                 if cleaned_content.startswith('---'):
                     end_marker = cleaned_content.find('---', 3)
                     if end_marker != -1:
-                        yaml_part = cleaned_content[3:end_marker].strip()
-                        try:
-                            import yaml
-                            metadata = yaml.safe_load(yaml_part)
-                            cleaned_content = cleaned_content[end_marker+3:].strip()
-                        except:
-                            pass
+                        for line in cleaned_content[3:end_marker].splitlines():
+                            key, sep, value = line.partition(":")
+                            if sep:
+                                metadata[key.strip()] = value.strip().strip("'\"")
+                        cleaned_content = cleaned_content[end_marker+3:].strip()
                 
                 # Try to find title from metadata or first heading
                 if metadata and 'title' in metadata:
@@ -412,7 +646,7 @@ Generated on: {timestamp}
                 
                 # Add metadata if available
                 if metadata:
-                    date = metadata.get('date', datetime.now().strftime("%B %d, %Y"))
+                    date = metadata.get('date', time.strftime("%B %d, %Y"))
                     report_id = metadata.get('id', 'N/A')
                     
                     meta_text = f"Generated on: {date}<br/>Report ID: {report_id}<br/>Confidential Document"
@@ -453,16 +687,18 @@ Generated on: {timestamp}
                 # Build the PDF
                 doc.build(elements)
             else:
-                # Neither wkhtmltopdf nor reportlab is available
+                # No PDF backend is available
                 raise RuntimeError(
-                    "Unable to generate PDF: wkhtmltopdf not found and reportlab is not installed.\n\n"
+                    "Unable to generate PDF: weasyprint and reportlab are not installed and wkhtmltopdf was not found.\n\n"
                     "Please install one of the following:\n"
                     "1. wkhtmltopdf (recommended):\n"
                     "   - macOS: brew install wkhtmltopdf\n"
                     "   - Ubuntu/Debian: sudo apt-get install wkhtmltopdf\n"
                     "   - Windows: Download from https://wkhtmltopdf.org/downloads.html\n\n"
                     "2. ReportLab (alternative):\n"
-                    "   - pip install reportlab\n"
+                    "   - pip install reportlab\n\n"
+                    "3. WeasyPrint (in-process, needs Pango):\n"
+                    "   - pip install weasyprint\n"
                 )
             
             # Check if PDF was created
@@ -489,21 +725,7 @@ Generated on: {timestamp}
     
     # Fallback for cleaning escape sequences if not imported
     if 'clean_escape_sequences' not in globals():
-        def clean_escape_sequences(content):
-            """Enhanced Python fallback for cleaning ANSI escape sequences"""
-            # First, handle text representations of ESC
-            esc_pattern = re.compile(r'ESC\[(\d+;)*\d*[a-zA-Z]|ESC\[\d+m|ESC\[0m|ESC\[1m|ESC\[4m|ESC\[\d+;\d+m')
-            content = esc_pattern.sub('', content)
-            
-            # Then handle actual ANSI escape sequences
-            ansi_pattern = re.compile(r'\x1B\[(\d+;)*\d*[a-zA-Z]|\x1B\[\d+m|\x1B\[0m|\x1B\[1m|\x1B\[4m|\x1B\[\d+;\d+m')
-            content = ansi_pattern.sub('', content)
-            
-            # More comprehensive pattern for any remaining escapes
-            full_pattern = re.compile(r'(?:\x1B|\bESC)(?:\[|\(|\))[^@-Z\\^_`a-z{|}~]*[@-Z\\^_`a-z{|}~]')
-            content = full_pattern.sub('', content)
-            
-            return content
+        clean_escape_sequences = _strip_escape_sequences
 
     def parse_report_metadata(content):
          """Basic Python implementation for parsing metadata."""
@@ -512,126 +734,624 @@ Generated on: {timestamp}
              if content.startswith("---"):
                  end_marker = content.find("---", 3)
                  if end_marker != -1:
-                     yaml_part = content[3:end_marker]
-                     import yaml # Lazy import
-                     data = yaml.safe_load(yaml_part)
-                     metadata["title"] = data.get("title", metadata["title"])
-                     metadata["date"] = data.get("date", metadata["date"])
-                     metadata["id"] = data.get("id", metadata["id"])
+                     # The header is flat "key: value" lines, so scan it instead of loading YAML
+                     for line in content[3:end_marker].splitlines():
+                         key, sep, value = line.partition(":")
+                         key = key.strip()
+                         if sep and key in metadata:
+                             metadata[key] = value.strip().strip("'\"") or metadata[key]
          except Exception:
              pass # Ignore parsing errors, return defaults
          return metadata
 
+    ProgressSnapshot = namedtuple("ProgressSnapshot", "percentage stage agent activity start_time")
+
     class BasicProgressTracker:
-        """Basic Python implementation for progress tracking."""
+        """Basic Python implementation for progress tracking.
+
+        State lives in one immutable snapshot that update() replaces whole, so the
+        display thread never reads fields from two different updates.
+        """
         def __init__(self):
             self.reset()
 
         def reset(self):
-            self.start_time = time.time()
-            self.percentage = 0.0
-            self.stage = "Initializing"
-            self.agent = "System"
-            self.activity = "Starting process"
+            self._snap = ProgressSnapshot(0.0, "Initializing", "System", "Starting process", time.time())
 
         def update(self, percentage, stage, agent, activity):
-            self.percentage = max(0.0, min(100.0, percentage))
-            self.stage = stage
-            self.agent = agent
-            self.activity = activity
+            self._snap = ProgressSnapshot(max(0.0, min(100.0, percentage)), stage, agent, activity, self._snap.start_time)
 
         def get_progress(self):
-            elapsed = time.time() - self.start_time
+            snap = self._snap
             return {
-                "percentage": self.percentage,
-                "stage": self.stage,
-                "agent": self.agent,
-                "activity": self.activity,
-                "elapsed_seconds": elapsed
+                "percentage": snap.percentage,
+                "stage": snap.stage,
+                "agent": snap.agent,
+                "activity": snap.activity,
+                "elapsed_seconds": time.time() - snap.start_time
             }
     # Note: ProgressTracker instance is created within FastCLI
 
+def _read_report_header(path: Path, max_bytes: int = 4096) -> str:
+    """
+    Read a report only as far as the end of its front-matter block.
+    
+    Args:
+        path: Report file
+        max_bytes: Chunk size; reading stops at the closing '---' or end of file
+        
+    Returns:
+        str: The start of the report, including the complete metadata header
+    """
+    chunks = []
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(max_bytes)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            head = "".join(chunks)
+            if not head.startswith("---") or head.find("\n---", 3) != -1:
+                return head
+    return "".join(chunks)
+
+# Report manager implementation, chosen once
+_make_report_manager = ReportManager if is_rust_enabled else BasicReportManager
+
+@functools.lru_cache(maxsize=4)
+def _get_report_manager(directory: str):
+    """Create the report manager for a directory on first use; later calls reuse it."""
+    return _make_report_manager(directory)
+
+def get_report_manager():
+    """Return the report manager for REPORTS_DIR."""
+    return _get_report_manager(str(REPORTS_DIR))
+
+def _save_report(file_name: str, content: str) -> str:
+    """
+    Save a finished report and return its path.
+    
+    Args:
+        file_name: Report filename inside REPORTS_DIR
+        content: Report text, already cleaned when it was assembled
+        
+    Returns:
+        str: Path of the saved report
+    """
+    manager = get_report_manager()
+    # Encode once and write bytes where the manager supports it (the Python one does)
+    save_bytes = getattr(manager, "save_report_bytes", None)
+    if save_bytes is not None:
+        path = save_bytes(file_name, content.encode('utf-8'))
+    else:
+        path = manager.save_report(file_name, content)
+    _invalidate_reports_cache()
+    return path
+
+def _scan_reports() -> List[Tuple[str, os.stat_result]]:
+    """
+    List reports with one directory sweep, newest first.
+    
+    Returns:
+        List of (filename, stat result) pairs; the stat is reused as the metadata cache key
+    """
+    with os.scandir(REPORTS_DIR) as entries:
+        reports = [(e.name, e.stat()) for e in entries if e.name.endswith(".md") and e.is_file()]
+    reports.sort(key=lambda item: item[1].st_mtime_ns, reverse=True)
+    return reports
+
+# Menus bounce between list/export/delete; reuse a listing for a few seconds
+_REPORTS_TTL = 5.0
+_REPORTS_LIST_CACHE: Dict[str, Any] = {"expires": 0.0, "entries": []}
+
+def _cached_reports() -> List[Tuple[str, os.stat_result]]:
+    """Return _scan_reports(), reusing the previous sweep until it is _REPORTS_TTL seconds old."""
+    now = time.monotonic()
+    if now >= _REPORTS_LIST_CACHE["expires"]:
+        _REPORTS_LIST_CACHE["entries"] = _scan_reports()
+        _REPORTS_LIST_CACHE["expires"] = now + _REPORTS_TTL
+    return list(_REPORTS_LIST_CACHE["entries"])
+
+def _invalidate_reports_cache() -> None:
+    """Force the next _cached_reports() call to rescan (after a report is saved or deleted)."""
+    _REPORTS_LIST_CACHE["expires"] = 0.0
+
+# filename -> (mtime_ns, metadata) for reports parsed outside the report manager's index
+_REPORT_META_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+def _get_report_metadata(filename: str, mtime_ns: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Return a report's metadata, reparsing the file only when it has changed.
+    
+    Args:
+        filename: Report filename inside REPORTS_DIR
+        mtime_ns: Modification time from _scan_reports (stat'ed here if omitted)
+        
+    Returns:
+        Dict: Parsed report metadata
+    """
+    get_indexed = getattr(get_report_manager(), "get_report_metadata", None)
+    metadata = get_indexed(filename) if get_indexed else None
+    if metadata is not None:
+        return metadata
+    
+    mtime = mtime_ns if mtime_ns is not None else (REPORTS_DIR / filename).stat().st_mtime_ns
+    cached = _REPORT_META_CACHE.get(filename)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    # Only the front matter is parsed, so don't read the report body
+    content = _read_report_header(REPORTS_DIR / filename)
+    try:
+        content = clean_escape_sequences(content)
+    except Exception:
+        pass # Parse the raw content if cleaning fails
+    metadata = parse_report_metadata(content)
+    # Rust returns (metadata, content); the Python fallback returns just the dict
+    if isinstance(metadata, tuple):
+        metadata = metadata[0]
+    _REPORT_META_CACHE[filename] = (mtime, metadata)
+    return metadata
+
+# path -> (mtime_ns, content) for the last few full reports read (viewed, exported, sent)
+_REPORT_CONTENT_CACHE: Dict[str, Tuple[int, str]] = {}
+_REPORT_CONTENT_CACHE_SIZE = 8
+
+def _read_report_cached(path: Path) -> str:
+    """
+    Read a report's full text, reusing the last read while the file is unchanged.
+    
+    Args:
+        path: Report file
+        
+    Returns:
+        str: Report content
+    """
+    key = str(path)
+    mtime = path.stat().st_mtime_ns
+    cached = _REPORT_CONTENT_CACHE.pop(key, None)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, path.read_text(encoding='utf-8'))
+    # Re-insert as most recent and evict the oldest entries beyond the cap
+    _REPORT_CONTENT_CACHE[key] = cached
+    while len(_REPORT_CONTENT_CACHE) > _REPORT_CONTENT_CACHE_SIZE:
+        del _REPORT_CONTENT_CACHE[next(iter(_REPORT_CONTENT_CACHE))]
+    return cached[1]
+
 # Check for Twilio credentials
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
 TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER")
 TWILIO_ENABLED = TWILIO_AVAILABLE and TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN and TWILIO_PHONE_NUMBER
 
-# Initialize typer app
-app = typer.Typer()
+# SMS carries the Executive Summary section, found in one regex pass over the report
+_EXEC_SUMMARY_RE = re.compile(r'(?ms)^## Executive Summary\s*\n(.*?)(?=\n## |\Z)')
+SMS_SUMMARY_MAX_CHARS = 1500
 
 # --- Generation Functions (Modified for Strict Error Handling) ---
 
-def generate_section_with_openai(topic: str, section_type: str, web_search_results=None) -> str:
-    """Generate a section of the market research report using OpenAI.
-    Raises OpenAIError if generation fails or ConfigurationError if not configured."""
+# Upper bound on section requests in flight at once to each provider, to stay clear of its
+# rate limits. Override with MAX_CONCURRENT_SECTIONS in .env (1 generates one section at a
+# time per provider).
+try:
+    MAX_CONCURRENT_SECTIONS = max(1, int(os.getenv("MAX_CONCURRENT_SECTIONS", "5")))
+except ValueError:
+    console.print("[yellow]⚠ MAX_CONCURRENT_SECTIONS must be a whole number; using 5.[/yellow]")
+    MAX_CONCURRENT_SECTIONS = 5
+
+def _section_cache_key(model: str, topic: str, section_type: str, web_search_results=None,
+                       temperature: float = 0.7, max_tokens: int = 1500) -> Optional[str]:
+    """Build the response cache key for a section, or None when caching is off."""
+    if response_cache is None:
+        return None
+    # Search results are identified by their URLs so the key survives snippet changes,
+    # and sorted so the same sources returned in a different order still hit
+    sources = sorted(result.get("url") or "" for result in web_search_results) if web_search_results else []
+    return make_cache_key(model=model, section_type=section_type, topic=topic, sources=sources,
+                          temperature=temperature, max_tokens=max_tokens)
+
+
+def _get_cached_section(cache_key: Optional[str]) -> Optional[str]:
+    """Return a cached section, or None on a miss (cache errors count as misses)."""
+    if cache_key is None:
+        return None
+    try:
+        return response_cache.get(cache_key)
+    except Exception as e:
+        console.print(f"[yellow]Warning: Could not read response cache: {str(e)}[/yellow]")
+        return None
+
+
+def _store_cached_section(cache_key: Optional[str], content: str) -> None:
+    """Save a generated section in the response cache, if caching is on."""
+    if cache_key is None:
+        return
+    try:
+        response_cache.set(cache_key, content)
+    except Exception as e:
+        console.print(f"[yellow]Warning: Could not write response cache: {str(e)}[/yellow]")
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One report stage: the section it writes and how its progress is shown."""
+    name: str
+    agent: str
+    activities: Tuple[str, ...]
+    preferred_model: str # Model used by the balanced strategy
+
+
+# Report stages in output order, built once at import
+STAGES: Tuple[Stage, ...] = (
+    Stage(
+        "Analyzing market trends",
+        "Agent 001: Market Analyst",
+        ("Gathering historical market data", "Identifying emerging trends", "Analyzing growth patterns", "Evaluating market adoption cycles"),
+        "openai",
+    ),
+    Stage(
+        "Gathering competitor data",
+        "Agent 002: Competitive Intelligence",
+        ("Identifying key market players", "Analyzing competitor strengths/weaknesses", "Mapping competitive positioning", "Evaluating market share"),
+        "claude",
+    ),
+    Stage(
+        "Identifying target audience",
+        "Agent 003: Demographics Specialist",
+        ("Segmenting customer base", "Analyzing demographic patterns", "Identifying key customer personas", "Mapping customer journey"),
+        "openai",
+    ),
+    Stage(
+        "Evaluating market size",
+        "Agent 004: Market Sizing Expert",
+        ("Calculating TAM", "Determining SAM", "Analyzing regional distribution", "Projecting penetration rates"),
+        "claude",
+    ),
+    Stage(
+        "Analyzing growth potential",
+        "Agent 005: Growth Strategist",
+        ("Identifying market opportunities", "Evaluating expansion potential", "Analyzing growth constraints", "Forecasting growth scenarios"),
+        "openai",
+    ),
+    Stage(
+        "Identifying risks and challenges",
+        "Agent 006: Risk Assessor",
+        ("Analyzing regulatory landscape", "Identifying entry barriers", "Evaluating competitive threats", "Assessing tech disruption risks"),
+        "claude",
+    ),
+    Stage(
+        "Generating recommendations",
+        "Agent 007: Strategic Advisor",
+        ("Synthesizing key findings", "Formulating strategic recommendations", "Prioritizing action items", "Developing implementation roadmap"),
+        "openai",
+    ),
+    Stage(
+        "Generating Executive Summary",
+        "Agent 008: Report Compiler",
+        ("Reviewing all sections", "Identifying key takeaways", "Drafting concise summary", "Formatting summary"),
+        "claude",
+    ),
+)
+# Which providers the balanced strategy needs, and each stage's model under it
+_STAGE_USES_OPENAI = any(stage.preferred_model == "openai" for stage in STAGES)
+_STAGE_USES_CLAUDE = any(stage.preferred_model == "claude" for stage in STAGES)
+_STAGE_MODEL_BALANCED: Tuple[str, ...] = tuple(stage.preferred_model for stage in STAGES)
+_STAGE_PREFERRED_MODEL: Dict[str, str] = {stage.name: stage.preferred_model for stage in STAGES}
+
+
+# System prompt templates per section, shared by both providers. Kept as fixed strings
+# so the prompt bytes are identical on every call, which Anthropic prompt caching
+# requires. Note the API only caches prefixes above a model-specific minimum (1024
+# tokens for Opus), so short prompts are sent with the marker but billed normally.
+SECTION_PROMPTS: Dict[str, str] = {
+    "Analyzing market trends": "You are a market research expert. Provide a comprehensive analysis of current and emerging trends in the {topic} market. Include data points, growth trends, and market adoption cycles. Format your response in markdown.",
+    "Gathering competitor data": "You are a competitive intelligence analyst. Identify and analyze key players in the {topic} market. Discuss their strengths, weaknesses, market positioning, and market share. Format your response in markdown.",
+    "Identifying target audience": "You are a demographics specialist. Segment and analyze the target audience for {topic}. Create detailed customer personas and discuss their needs, preferences, and behaviors. Format your response in markdown.",
+    "Evaluating market size": "You are a market sizing expert. Calculate and analyze the Total Addressable Market (TAM) and Serviceable Available Market (SAM) for {topic}. Include regional distribution and market penetration rates. Format your response in markdown.",
+    "Analyzing growth potential": "You are a growth strategist. Identify and evaluate growth opportunities in the {topic} market. Discuss expansion potential, constraints, and forecast different growth scenarios. Format your response in markdown.",
+    "Identifying risks and challenges": "You are a risk assessment expert. Analyze the regulatory landscape, market entry barriers, competitive threats, and technological disruptions in the {topic} market. Format your response in markdown.",
+    "Generating recommendations": "You are a strategic advisor. Based on a comprehensive analysis of the {topic} market, provide strategic recommendations. Prioritize action items and develop an implementation roadmap. Format your response in markdown.",
+}
+# Includes "Finalizing report"
+DEFAULT_SECTION_PROMPT = "You are a market research expert. Please provide detailed information about {section} for the {topic} market. Format your response in markdown."
+
+# User message templates
+SECTION_USER_PROMPT = "Please generate the {section_type} section for a {topic} market research report."
+SECTION_USER_PROMPT_WITH_SEARCH = SECTION_USER_PROMPT + "\n\nUse the following web search results for context:\n{search_content}"
+
+
+def build_section_prompts(topic: str, section_type: str, web_search_results=None,
+                          search_context: Optional[str] = None) -> Tuple[str, str]:
+    """Return the (system prompt, user message) pair for a report section.
+
+    search_context is web_search_results already formatted for the prompt, when the
+    caller has it.
+    """
+    template = SECTION_PROMPTS.get(section_type, DEFAULT_SECTION_PROMPT)
+    system_prompt = template.format(topic=topic, section=section_type.lower())
+    if web_search_results:
+        search_content = search_context or format_search_results_for_prompt(web_search_results)
+        user_message = SECTION_USER_PROMPT_WITH_SEARCH.format(section_type=section_type, topic=topic, search_content=search_content)
+    else:
+        user_message = SECTION_USER_PROMPT.format(section_type=section_type, topic=topic)
+    return system_prompt, user_message
+
+
+def _check_openai_config() -> None:
+    """Raise ConfigurationError unless OpenAI calls can be made."""
     if not OPENAI_API_KEY:
          raise ConfigurationError("OpenAI API key is not configured.")
+    if get_openai_client() is None:
+         raise ConfigurationError("OpenAI client failed to initialize.")
 
+
+def _check_claude_config() -> None:
+    """Raise ConfigurationError unless Claude calls can be made."""
+    if CLAUDE_READY or ensure_claude_client():
+        return
+    # Only the failure path works out which requirement is missing
+    if not CLAUDE_API_KEY:
+        raise ConfigurationError("Claude API key is not configured. Cannot use Claude.")
+    if not CLAUDE_AVAILABLE:
+        raise ConfigurationError("Claude (anthropic library) is not installed or failed to initialize. Cannot use Claude.")
+    raise ConfigurationError("Installed 'anthropic' library version is too old or Messages API is not available. Please upgrade: pip install --upgrade anthropic")
+
+
+# Error types (shared by the openai and anthropic SDKs) worth retrying; auth, billing
+# and bad-request errors fail straight away
+_TRANSIENT_API_ERRORS = {"RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError", "OverloadedError"}
+
+
+def _is_transient_api_error(exc: BaseException) -> bool:
+    """Return True for rate limits, timeouts, dropped connections and overloaded servers."""
+    return any(cls.__name__ in _TRANSIENT_API_ERRORS for cls in type(exc).__mro__)
+
+
+def _caused_by_transient_api_error(exc: Optional[BaseException]) -> bool:
+    """Return True if exc, or an error it was raised from, is a transient API error."""
+    while exc is not None:
+        if _is_transient_api_error(exc):
+            return True
+        exc = exc.__cause__
+    return False
+
+
+# Attempts per section request (including the first) and the longest backoff, in seconds
+API_RETRY_ATTEMPTS = 4
+API_RETRY_MAX_WAIT = 20
+# A report whose sections still fail on transient errors after those retries is
+# regenerated whole a couple of times; sections that succeeded come back from the
+# response cache, so a rerun only pays for the ones that failed
+REPORT_GENERATION_ATTEMPTS = 3
+
+
+def _log_api_retry(retry_state) -> None:
+    """Tell the user a request is being retried, so a slow section isn't mistaken for a hang."""
+    exc = retry_state.outcome.exception()
+    console.print(f"[yellow]⚠ {type(exc).__name__}: retrying in {retry_state.next_action.sleep:.1f}s "
+                  f"(attempt {retry_state.attempt_number + 1} of {API_RETRY_ATTEMPTS})[/yellow]")
+
+
+if TENACITY_AVAILABLE:
+    _retry_transient = retry(
+        stop=stop_after_attempt(API_RETRY_ATTEMPTS),
+        wait=wait_random_exponential(min=1, max=API_RETRY_MAX_WAIT),
+        retry=retry_if_exception(_is_transient_api_error),
+        before_sleep=_log_api_retry,
+        reraise=True,
+    )
+    # tenacity owns the retries for section calls, so the SDK shouldn't retry underneath it
+    _SECTION_CALL_SDK_RETRIES = 0
+else:
+    def _retry_transient(func):
+        return func
+    _SECTION_CALL_SDK_RETRIES = 2
+
+
+@_retry_transient
+async def _complete_with_openai(system_prompt: str, user_content: str, max_tokens: int = 1500,
+                               on_text: Optional[Callable[[str], None]] = None) -> str:
+    """Stream one chat completion through the shared OpenAI client and return its text.
+
+    on_text, if given, is called with each chunk of text as it arrives.
+    """
+    console.print(f"[cyan]Attempting OpenAI API with {OPENAI_MODEL}...[/cyan]")
+    client = get_openai_client().with_options(max_retries=_SECTION_CALL_SDK_RETRIES)
+    stream = await client.chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ],
+        max_tokens=max_tokens,
+        temperature=0.7,
+        stream=True,
+    )
+    parts = []
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        text = chunk.choices[0].delta.content
+        if text:
+            parts.append(text)
+            if on_text:
+                on_text(text)
+    return "".join(parts).strip()
+
+
+@_retry_transient
+async def _complete_with_claude(system_prompt: str, user_message: str, max_tokens: int = 1500,
+                               on_text: Optional[Callable[[str], None]] = None) -> str:
+    """Stream one message through the shared Claude client and return its text.
+
+    on_text, if given, is called with each chunk of text as it arrives.
+    """
+    client = claude_async_client.with_options(max_retries=_SECTION_CALL_SDK_RETRIES)
+    async with client.messages.stream(
+        model=CLAUDE_MODEL,
+        # Mark the system prompt as a cacheable prefix for Anthropic prompt caching
+        system=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+        messages=[
+            {"role": "user", "content": user_message}
+        ],
+        max_tokens=max_tokens,
+        temperature=0.7,
+    ) as stream:
+        parts = []
+        async for text in stream.text_stream:
+            parts.append(text)
+            if on_text:
+                on_text(text)
+        response = await stream.get_final_message()
+
+    # Report prompt-cache hits so caching can be confirmed from the console
+    usage = getattr(response, "usage", None)
+    cache_read_tokens = getattr(usage, "cache_read_input_tokens", 0) or 0
+    if cache_read_tokens:
+        console.print(f"[cyan]Claude prompt cache hit: {cache_read_tokens} input tokens read from cache[/cyan]")
+
+    if not parts:
+        raise ClaudeError("Empty or unexpected content in Claude Messages API response.")
+    return "".join(parts)
+
+
+_local_embedder = None
+_local_embedder_lock = threading.Lock()
+# topic -> task computing its embedding, so concurrent sections embed a topic once;
+# the oldest topics are dropped past TOPIC_EMBEDDINGS_MAX
+_topic_embeddings: Dict[str, Any] = {}
+TOPIC_EMBEDDINGS_MAX = 32
+
+
+def _encode_locally(topic: str) -> Any:
+    """Embed a topic with sentence-transformers, loading the model on first use (blocking)."""
+    global _local_embedder
+    # Loading the model takes seconds; the lock keeps concurrent sections from loading it twice
+    with _local_embedder_lock:
+        if _local_embedder is None:
+            from sentence_transformers import SentenceTransformer
+            _local_embedder = SentenceTransformer(SEMANTIC_LOCAL_MODEL)
+    return _local_embedder.encode(topic)
+
+
+async def _compute_topic_embedding(topic: str) -> Optional[Tuple[str, Any]]:
+    """Embed a topic, returning (backend name, vector) or None if no backend is usable."""
+    if importlib.util.find_spec("sentence_transformers") is not None:
+        # Model load and encode both block, so keep them off the event loop
+        return SEMANTIC_LOCAL_MODEL, await asyncio.to_thread(_encode_locally, topic)
+    client = get_openai_client()
+    if client is None:
+        return None
+    response = await client.embeddings.create(model=OPENAI_EMBEDDING_MODEL, input=topic)
+    return OPENAI_EMBEDDING_MODEL, response.data[0].embedding
+
+
+async def _embed_topic(topic: str) -> Optional[Tuple[str, Any]]:
+    """Return the (memoized) embedding of a topic, or None if embedding failed."""
+    task = _topic_embeddings.get(topic)
+    if task is None:
+        task = asyncio.ensure_future(_compute_topic_embedding(topic))
+        _topic_embeddings[topic] = task
+        if len(_topic_embeddings) > TOPIC_EMBEDDINGS_MAX:
+            del _topic_embeddings[next(iter(_topic_embeddings))]
     try:
-        # Create a system prompt
-        if section_type == "Analyzing market trends":
-            prompt = f"You are a market research expert. Provide a comprehensive analysis of current and emerging trends in the {topic} market. Include data points, growth trends, and market adoption cycles. Format your response in markdown."
-        elif section_type == "Gathering competitor data":
-            prompt = f"You are a competitive intelligence analyst. Identify and analyze key players in the {topic} market. Discuss their strengths, weaknesses, market positioning, and market share. Format your response in markdown."
-        elif section_type == "Identifying target audience":
-            prompt = f"You are a demographics specialist. Segment and analyze the target audience for {topic}. Create detailed customer personas and discuss their needs, preferences, and behaviors. Format your response in markdown."
-        elif section_type == "Evaluating market size":
-            prompt = f"You are a market sizing expert. Calculate and analyze the Total Addressable Market (TAM) and Serviceable Available Market (SAM) for {topic}. Include regional distribution and market penetration rates. Format your response in markdown."
-        elif section_type == "Analyzing growth potential":
-            prompt = f"You are a growth strategist. Identify and evaluate growth opportunities in the {topic} market. Discuss expansion potential, constraints, and forecast different growth scenarios. Format your response in markdown."
-        elif section_type == "Identifying risks and challenges":
-            prompt = f"You are a risk assessment expert. Analyze the regulatory landscape, market entry barriers, competitive threats, and technological disruptions in the {topic} market. Format your response in markdown."
-        elif section_type == "Generating recommendations":
-            prompt = f"You are a strategic advisor. Based on a comprehensive analysis of the {topic} market, provide strategic recommendations. Prioritize action items and develop an implementation roadmap. Format your response in markdown."
-        else: # Includes "Finalizing report"
-            prompt = f"You are a market research expert. Please provide detailed information about {section_type.lower()} for the {topic} market. Format your response in markdown."
-
-        # Prepare user content
-        if web_search_results:
-            search_content = format_search_results_for_prompt(web_search_results)
-            user_content = f"Please generate the {section_type} section for a {topic} market research report.\n\nUse the following web search results for context:\n{search_content}"
-        else:
-            user_content = f"Please generate the {section_type} section for a {topic} market research report."
+        return await task
+    except Exception as e:
+        # Forget the failure so the next request for this topic tries again
+        if _topic_embeddings.get(topic) is task:
+            del _topic_embeddings[topic]
+        console.print(f"[yellow]Warning: Could not embed topic for semantic cache: {str(e)}[/yellow]")
+        return None
+
+
+async def _semantic_cache_entry(model: str, topic: str, section_type: str, web_search_results=None) -> Optional[Tuple[str, Any]]:
+    """Return the (namespace, embedding) for a semantic cache lookup, or None if it does not apply."""
+    # Search-grounded sections must reflect their own sources, so only plain topics are matched
+    if semantic_cache is None or web_search_results:
+        return None
+    embedded = await _embed_topic(topic)
+    if embedded is None:
+        return None
+    backend, embedding = embedded
+    return f"{backend}|{model}|{section_type}", embedding
+
+
+def _get_semantic_section(entry: Optional[Tuple[str, Any]], section_type: str) -> Optional[str]:
+    """Return a section cached for a similar topic, or None on a miss."""
+    if entry is None:
+        return None
+    try:
+        hit = semantic_cache.get(*entry)
+    except Exception as e:
+        console.print(f"[yellow]Warning: Could not read semantic cache: {str(e)}[/yellow]")
+        return None
+    if hit is None:
+        return None
+    content, cached_topic, score = hit
+    console.print(f"[green]✓ Reusing '{section_type}' from similar topic '{cached_topic}' (similarity {score:.2f})[/green]")
+    return content
+
+
+def _store_semantic_section(entry: Optional[Tuple[str, Any]], topic: str, content: str) -> None:
+    """Save a generated section in the semantic cache, if it applies."""
+    if entry is None:
+        return
+    try:
+        semantic_cache.set(entry[0], entry[1], topic, content)
+    except Exception as e:
+        console.print(f"[yellow]Warning: Could not write semantic cache: {str(e)}[/yellow]")
 
-        # Initialize OpenAI client
-        client = OpenAI()
 
-        # Try using the recommended model first (GPT-4 Turbo)
-        try:
-            console.print(f"[cyan]Attempting OpenAI API with gpt-4-turbo-preview...[/cyan]")
-            completion = client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": user_content}
-                ],
-                max_tokens=1500,
-                temperature=0.7,
-            )
-            return completion.choices[0].message.content.strip()
+# Cache state for one section request: (exact-match key, semantic cache entry)
+SectionCacheKeys = Tuple[Optional[str], Optional[Tuple[str, Any]]]
 
-        except Exception as e_gpt4:
-            console.print(f"[yellow]Warning: Could not use GPT-4 Turbo: {str(e_gpt4)}. Falling back to GPT-3.5 Turbo.[/yellow]")
 
-            # Fall back to GPT-3.5 Turbo
-            try:
-                console.print(f"[cyan]Attempting OpenAI API with gpt-3.5-turbo...[/cyan]")
-                completion = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": prompt},
-                        {"role": "user", "content": user_content}
-                    ],
-                    max_tokens=1000,
-                    temperature=0.7,
-                )
-                return completion.choices[0].message.content.strip()
-            except Exception as e_gpt35:
-                # If both models fail, raise our custom error
-                error_message = f"Both GPT-4 Turbo and GPT-3.5 Turbo failed. Last error: {str(e_gpt35)}"
-                console.print(f"[red]OpenAI API Error: {error_message}[/red]")
-                raise OpenAIError(error_message) from e_gpt35
+async def _lookup_section(model: str, topic: str, section_type: str,
+                          web_search_results=None) -> Tuple[Optional[str], SectionCacheKeys]:
+    """Check the exact-match cache, then the semantic cache, for a section.
+
+    Returns the cached content (None on a miss) and the keys to store a fresh
+    response under with _store_section.
+    """
+    cache_key = _section_cache_key(model, topic, section_type, web_search_results)
+    cached = _get_cached_section(cache_key)
+    if cached is not None:
+        console.print(f"[green]✓ Using cached section: {section_type}[/green]")
+        return cached, (cache_key, None)
+    semantic_entry = await _semantic_cache_entry(model, topic, section_type, web_search_results)
+    return _get_semantic_section(semantic_entry, section_type), (cache_key, semantic_entry)
+
+
+def _store_section(keys: SectionCacheKeys, topic: str, content: str) -> None:
+    """Save a generated section in both caches, where they apply."""
+    cache_key, semantic_entry = keys
+    _store_cached_section(cache_key, content)
+    _store_semantic_section(semantic_entry, topic, content)
+
+
+async def generate_section_with_openai(topic: str, section_type: str, web_search_results=None,
+                                      on_text: Optional[Callable[[str], None]] = None,
+                                      search_context: Optional[str] = None) -> str:
+    """Generate a section of the market research report using OpenAI.
+    Raises OpenAIError if generation fails or ConfigurationError if not configured."""
+    _check_openai_config()
+
+    try:
+        cached, cache_keys = await _lookup_section(f"openai:{OPENAI_MODEL}", topic, section_type, web_search_results)
+        if cached is not None:
+            return cached
+
+        # Look up the prompts for this section
+        prompt, user_content = build_section_prompts(topic, section_type, web_search_results, search_context)
+        try:
+            content = await _complete_with_openai(prompt, user_content, on_text=on_text)
+        except Exception as e_api:
+            error_message = f"{OPENAI_MODEL} request failed: {str(e_api)}"
+            console.print(f"[red]OpenAI API Error: {error_message}[/red]")
+            raise OpenAIError(error_message) from e_api
+
+        _store_section(cache_keys, topic, content)
+        return content
 
     except Exception as e:
         # Catch any other unexpected error during setup or execution
@@ -640,65 +1360,26 @@ def generate_section_with_openai(topic: str, section_type: str, web_search_resul
         raise OpenAIError(error_message) from e
 
 
-def generate_section_with_claude(topic: str, section_type: str, web_search_results=None) -> str:
+async def generate_section_with_claude(topic: str, section_type: str, web_search_results=None,
+                                      on_text: Optional[Callable[[str], None]] = None,
+                                      search_context: Optional[str] = None) -> str:
     """Generate a section of the market research report using Claude API.
     Raises ClaudeError if generation fails or ConfigurationError if not configured."""
 
     # Check configuration *before* attempting API calls
-    if not CLAUDE_AVAILABLE:
-        raise ConfigurationError("Claude (anthropic library) is not installed. Cannot use Claude.")
-    if not CLAUDE_API_KEY:
-        raise ConfigurationError("Claude API key is not configured. Cannot use Claude.")
-    if claude_client is None:
-         raise ConfigurationError("Claude client failed to initialize. Cannot use Claude.")
-    if not hasattr(claude_client, "messages") or not callable(getattr(claude_client.messages, "create", None)):
-         raise ConfigurationError("Installed 'anthropic' library version is too old or Messages API is not available. Please upgrade: pip install --upgrade anthropic")
+    _check_claude_config()
 
     try:
-        # Create a system prompt
-        if section_type == "Analyzing market trends":
-            system_prompt = f"You are a market research expert. Provide a comprehensive analysis of current and emerging trends in the {topic} market. Include data points, growth trends, and market adoption cycles. Format your response in markdown."
-        elif section_type == "Gathering competitor data":
-            system_prompt = f"You are a competitive intelligence analyst. Identify and analyze key players in the {topic} market. Discuss their strengths, weaknesses, market positioning, and market share. Format your response in markdown."
-        elif section_type == "Identifying target audience":
-            system_prompt = f"You are a demographics specialist. Segment and analyze the target audience for {topic}. Create detailed customer personas and discuss their needs, preferences, and behaviors. Format your response in markdown."
-        elif section_type == "Evaluating market size":
-            system_prompt = f"You are a market sizing expert. Calculate and analyze the Total Addressable Market (TAM) and Serviceable Available Market (SAM) for {topic}. Include regional distribution and market penetration rates. Format your response in markdown."
-        elif section_type == "Analyzing growth potential":
-            system_prompt = f"You are a growth strategist. Identify and evaluate growth opportunities in the {topic} market. Discuss expansion potential, constraints, and forecast different growth scenarios. Format your response in markdown."
-        elif section_type == "Identifying risks and challenges":
-            system_prompt = f"You are a risk assessment expert. Analyze the regulatory landscape, market entry barriers, competitive threats, and technological disruptions in the {topic} market. Format your response in markdown."
-        elif section_type == "Generating recommendations":
-             system_prompt = f"You are a strategic advisor. Based on a comprehensive analysis of the {topic} market, provide strategic recommendations. Prioritize action items and develop an implementation roadmap. Format your response in markdown."
-        else: # Includes "Finalizing report"
-             system_prompt = f"You are a market research expert. Please provide detailed information about {section_type.lower()} for the {topic} market. Format your response in markdown."
-
-        # Format user message
-        if web_search_results:
-            search_content = format_search_results_for_prompt(web_search_results)
-            user_message = f"Please generate the {section_type} section for a {topic} market research report.\n\nUse the following web search results for context:\n{search_content}"
-        else:
-            user_message = f"Please generate the {section_type} section for a {topic} market research report."
-
-        # Use the claude-3-opus-20240229 model with system prompt as top-level parameter
-        response = claude_client.messages.create(
-            model="claude-3-opus-20240229",
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_message}
-            ],
-            max_tokens=1500,
-            temperature=0.7,
-        )
+        cached, cache_keys = await _lookup_section(f"claude:{CLAUDE_MODEL}", topic, section_type, web_search_results)
+        if cached is not None:
+            return cached
 
-        # Extract content from response
-        if response.content and isinstance(response.content, list) and len(response.content) > 0:
-            if hasattr(response.content[0], 'text'):
-                return response.content[0].text
-            else:
-                raise ClaudeError("Unexpected response structure from Claude Messages API (missing text).")
-        else:
-            raise ClaudeError("Empty or unexpected content in Claude Messages API response.")
+        # Look up the prompts for this section; the templates keep the system prompt
+        # bytes stable between calls
+        system_prompt, user_message = build_section_prompts(topic, section_type, web_search_results, search_context)
+        content = await _complete_with_claude(system_prompt, user_message, on_text=on_text)
+        _store_section(cache_keys, topic, content)
+        return content
 
     except Exception as e:
         error_message = f"Claude API Error: {str(e)}"
@@ -706,6 +1387,62 @@ def generate_section_with_claude(topic: str, section_type: str, web_search_resul
         raise ClaudeError(error_message) from e
 
 
+# Single-request mode: every section is produced by one completion and split on markers
+SINGLE_CALL_MARKER = "### SECTION::"
+SINGLE_CALL_SYSTEM_PROMPT = "You are a team of market research experts covering market trends, competitive intelligence, demographics, market sizing, growth strategy, risk assessment and strategic advice. Format your response in markdown."
+SINGLE_CALL_USER_PROMPT = "Produce a market research report on the {topic} market with exactly these sections, in this order. Start each section with a line containing only `" + SINGLE_CALL_MARKER + "<name>`, using the names exactly as listed:\n{section_list}"
+# Output token budgets for the whole report (Claude 3 Opus caps output at 4096 tokens)
+SINGLE_CALL_MAX_TOKENS = {"openai": 8000, "claude": 4096}
+# Search results included in the combined prompt
+SINGLE_CALL_MAX_SOURCES = 20
+_SINGLE_CALL_SPLIT = re.compile(r"(?m)^" + re.escape(SINGLE_CALL_MARKER) + r"[ \t]*(.+?)[ \t]*$")
+
+
+async def generate_all_sections_single_call(topic: str, section_types: List[str], model_to_use: str,
+                                            web_search_results=None,
+                                            on_text: Optional[Callable[[str], None]] = None) -> Dict[str, str]:
+    """Generate every section with one model request and split the reply by section.
+
+    Returns a mapping of section type to content; sections the model skipped are
+    absent from the mapping. Raises OpenAIError/ClaudeError if the request fails.
+    """
+    error_type = ClaudeError if model_to_use == "claude" else OpenAIError
+    if model_to_use == "claude":
+        _check_claude_config()
+        model_name = f"claude:{CLAUDE_MODEL}"
+    else:
+        _check_openai_config()
+        model_name = f"openai:{OPENAI_MODEL}"
+    max_tokens = SINGLE_CALL_MAX_TOKENS[model_to_use]
+
+    section_list = "\n".join(f"- {section_type}" for section_type in section_types)
+    user_message = SINGLE_CALL_USER_PROMPT.format(topic=topic, section_list=section_list)
+    if web_search_results:
+        search_content = format_search_results_for_prompt(web_search_results)
+        user_message += f"\n\nUse the following web search results for context:\n{search_content}"
+
+    try:
+        cache_key = _section_cache_key(model_name, topic, "\n".join(section_types), web_search_results, max_tokens=max_tokens)
+        content = _get_cached_section(cache_key)
+        if content is not None:
+            console.print("[green]✓ Using cached report sections[/green]")
+        else:
+            console.print(f"\n[bold]Generating all {len(section_types)} sections in one request using {model_to_use.upper()}...[/bold]")
+            if model_to_use == "claude":
+                content = await _complete_with_claude(SINGLE_CALL_SYSTEM_PROMPT, user_message, max_tokens, on_text)
+            else:
+                content = await _complete_with_openai(SINGLE_CALL_SYSTEM_PROMPT, user_message, max_tokens, on_text)
+            _store_cached_section(cache_key, content)
+    except Exception as e:
+        error_message = f"Single-request generation failed: {str(e)}"
+        console.print(f"[red]{error_message}[/red]")
+        raise error_type(error_message) from e
+
+    # re.split with one group yields [preamble, name1, body1, name2, body2, ...]
+    parts = _SINGLE_CALL_SPLIT.split(content)
+    return {name: body.strip() for name, body in zip(parts[1::2], parts[2::2])}
+
+
 def generate_fallback_content(topic: str, section_type: str) -> str:
     """Generate fallback content ONLY when no APIs are configured/available from the start."""
     # This function should ideally NOT be called during generation if a model preference was set.
@@ -720,19 +1457,23 @@ To generate actual content, please ensure your API keys (OpenAI and/or Claude) a
 """
 
 
+# Report section title for each stage name
+STAGE_TITLES = {
+    "Analyzing market trends": "Market Trends Analysis",
+    "Gathering competitor data": "Competitive Landscape",
+    "Identifying target audience": "Target Audience Analysis",
+    "Evaluating market size": "Market Size and Opportunity",
+    "Analyzing growth potential": "Growth Strategy and Potential",
+    "Identifying risks and challenges": "Risk Assessment and Challenges",
+    "Generating recommendations": "Strategic Recommendations",
+    "Generating Executive Summary": "Executive Summary",
+    "Finalizing report": "Executive Summary", # Often generated near the end
+}
+
+
 def convert_stage_to_title(stage: str) -> str:
     """Convert a stage name to a proper section title."""
-    mapping = {
-        "Analyzing market trends": "Market Trends Analysis",
-        "Gathering competitor data": "Competitive Landscape",
-        "Identifying target audience": "Target Audience Analysis",
-        "Evaluating market size": "Market Size and Opportunity",
-        "Analyzing growth potential": "Growth Strategy and Potential",
-        "Identifying risks and challenges": "Risk Assessment and Challenges",
-        "Generating recommendations": "Strategic Recommendations",
-        "Finalizing report": "Executive Summary", # Often generated near the end
-    }
-    return mapping.get(stage, stage)
+    return STAGE_TITLES.get(stage, stage)
 
 
 def display_ascii_title():
@@ -777,31 +1518,450 @@ def display_ascii_title():
 
 # --- Core Report Generation Orchestrator (Modified for Strict Error Handling) ---
 
-def generate_market_research_report(topic: str, progress_callback=None, model_preference="balanced", use_web_search=False) -> Optional[str]:
+# Async clients hold pooled connections tied to the loop that opened them, so every
+# report runs on the same long-lived loop rather than a fresh asyncio.run() loop
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, creating it on first use."""
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+    return _event_loop
+
+
+def _run_async(coro):
+    """Run a coroutine to completion on the shared event loop."""
+    return _get_event_loop().run_until_complete(coro)
+
+
+def _format_search_contexts(search_results_by_stage: Dict[str, List[Dict[str, str]]]) -> Dict[str, str]:
+    """Format each stage's search results for its prompt.
+
+    Stages whose own search came back empty share the topic results list, so each
+    distinct list is formatted only once.
+    """
+    formatted: Dict[int, str] = {}
+    contexts = {}
+    for stage_name, results in search_results_by_stage.items():
+        if results:
+            if id(results) not in formatted:
+                formatted[id(results)] = format_search_results_for_prompt(results)
+            contexts[stage_name] = formatted[id(results)]
+    return contexts
+
+
+# Streamed text is reported to the progress display every this many words
+STREAM_PROGRESS_WORDS = 50
+# Rough length of a full section (1500 max tokens at ~0.75 words per token), used to
+# credit a section's partial progress while it streams
+SECTION_EXPECTED_WORDS = 1100
+
+
+def _stream_progress_reporter(progress_callback, stage_name: str, agent: str,
+                              current_progress: Callable[[], float],
+                              on_words: Optional[Callable[[int], None]] = None) -> Optional[Callable[[str], None]]:
+    """Return an on_text callback that reports how much of a section has streamed in.
+
+    on_words, if given, receives the running word count before each progress report.
+    """
+    if not progress_callback:
+        return None
+    words = 0
+    reported_words = 0
+
+    def on_text(text: str) -> None:
+        nonlocal words, reported_words
+        words += len(text.split())
+        if words - reported_words >= STREAM_PROGRESS_WORDS:
+            if on_words:
+                on_words(words)
+            progress_callback(current_progress(), stage_name, agent, f"Writing section (~{words} words so far)",
+                              new_words=words - reported_words)
+            reported_words = words
+
+    return on_text
+
+
+async def _generate_all_sections(topic: str, stage_plan: List[Tuple[Stage, str]], search_results_by_stage=None,
+                                 progress_callback=None, start_progress: float = 0) -> List[Any]:
+    """Generate every stage's section concurrently.
+
+    Stage prompts depend only on the topic and each stage's search results, never
+    on earlier sections, so all requests can be in flight together. Returns one
+    entry per stage, in stage order: the section text, or the exception that
+    stage raised.
+    """
+    search_results_by_stage = search_results_by_stage or {}
+    search_contexts = _format_search_contexts(search_results_by_stage)
+    # Rate limits are per provider, so in balanced mode OpenAI and Claude sections
+    # don't queue behind each other
+    semaphores = {model: asyncio.Semaphore(MAX_CONCURRENT_SECTIONS) for model in {model for _, model in stage_plan}}
+    completed_sections = 0
+    # Fraction of each in-flight section streamed so far, so the bar moves while
+    # sections are being written rather than only when they finish
+    streamed_fractions: Dict[str, float] = {}
+
+    def current_progress() -> float:
+        done = completed_sections + sum(streamed_fractions.values())
+        progress = start_progress + (done / len(stage_plan)) * (100 - start_progress)
+        # Cap below 100 until the whole report is assembled
+        return min(progress, 99.9)
+
+    async def run_stage(stage: Stage, model_to_use: str) -> str:
+        nonlocal completed_sections
+        # Progress comes from the request itself: its start, streamed text and completion
+        if progress_callback:
+            progress_callback(current_progress(), stage.name, stage.agent, stage.activities[0])
+
+        def on_words(words: int) -> None:
+            streamed_fractions[stage.name] = min(words / SECTION_EXPECTED_WORDS, 1.0)
+
+        async with semaphores[model_to_use]:
+            console.print(f"\n[bold]Generating section: '{stage.name}' using {model_to_use.upper()}...[/bold]")
+            on_text = _stream_progress_reporter(progress_callback, stage.name, stage.agent, current_progress, on_words)
+            if model_to_use == "claude":
+                section_content = await generate_section_with_claude(topic, stage.name, search_results_by_stage.get(stage.name), on_text,
+                                                                     search_contexts.get(stage.name))
+            elif model_to_use == "openai":
+                section_content = await generate_section_with_openai(topic, stage.name, search_results_by_stage.get(stage.name), on_text,
+                                                                     search_contexts.get(stage.name))
+            else:
+                # This case should be prevented by earlier checks
+                raise ConfigurationError(f"Invalid model '{model_to_use}' determined for stage '{stage.name}'.")
+
+        streamed_fractions.pop(stage.name, None)
+        completed_sections += 1
+        if progress_callback:
+            progress_callback(current_progress(), stage.name, stage.agent, stage.activities[-1])
+        return section_content
+
+    return await asyncio.gather(*(run_stage(stage, model) for stage, model in stage_plan), return_exceptions=True)
+
+
+async def _generate_all_sections_single_call(topic: str, stage_plan: List[Tuple[Stage, str]], search_results_by_stage=None,
+                                             progress_callback=None, start_progress: float = 0) -> List[Any]:
+    """Generate every section with a single model request.
+
+    Uses Claude only when every stage is assigned to Claude, otherwise OpenAI.
+    Sections missing from the reply fall back to one request each. Returns one
+    entry per stage, in stage order: the section text, or the exception for
+    that stage.
+    """
+    model_to_use = "claude" if all(model == "claude" for _, model in stage_plan) else "openai"
+    section_types = [stage.name for stage, _ in stage_plan]
+    if progress_callback:
+        progress_callback(start_progress, "All sections", "Agent 008: Report Compiler", "Drafting every section in one request")
+
+    # One prompt serves every section, so merge the stage searches without repeating URLs
+    merged_results = []
+    seen_urls = set()
+    for results in (search_results_by_stage or {}).values():
+        for result in results:
+            if result.get("url") not in seen_urls:
+                seen_urls.add(result.get("url"))
+                merged_results.append(result)
+    merged_results = merged_results[:SINGLE_CALL_MAX_SOURCES]
+    on_text = _stream_progress_reporter(progress_callback, "All sections", "Agent 008: Report Compiler", lambda: start_progress)
+    sections = await generate_all_sections_single_call(topic, section_types, model_to_use, merged_results or None, on_text)
+
+    results: List[Any] = [sections.get(stage.name) or None for stage, _ in stage_plan]
+    # A truncated or malformed reply can drop sections; request just those one by one
+    missing = [index for index, content in enumerate(results) if content is None]
+    if missing:
+        missing_names = ", ".join(stage_plan[index][0].name for index in missing)
+        console.print(f"[yellow]⚠ Combined response was missing {len(missing)} section(s) ({missing_names}); generating them separately.[/yellow]")
+        retried = await _generate_all_sections(topic, [stage_plan[index] for index in missing], search_results_by_stage,
+                                               progress_callback, start_progress)
+        for index, content in zip(missing, retried):
+            results[index] = content
+    if progress_callback:
+        progress_callback(99.9, "All sections", "Agent 008: Report Compiler", "Splitting response into sections")
+    return results
+
+
+async def _generate_all_sections_batch(topic: str, stage_plan: List[Tuple[Stage, str]], search_results_by_stage=None,
+                                       progress_callback=None, start_progress: float = 0) -> List[Any]:
+    """Generate every section through one OpenAI Batch API job.
+
+    Batch requests cost half as much as online calls but may take up to 24 hours
+    to complete, so this suits unattended runs. Returns one entry per stage, in
+    stage order: the section text, or the exception for that stage.
+    """
+    _check_openai_config()
+    client = get_openai_client()
+
+    results: List[Any] = [None] * len(stage_plan)
+    cache_keys = {}
+    request_lines = []
+    search_results_by_stage = search_results_by_stage or {}
+    search_contexts = _format_search_contexts(search_results_by_stage)
+    for index, (stage, _) in enumerate(stage_plan):
+        stage_name = stage.name
+        web_search_results = search_results_by_stage.get(stage_name)
+        cache_keys[stage_name] = _section_cache_key(f"openai:{OPENAI_MODEL}", topic, stage_name, web_search_results)
+        cached = _get_cached_section(cache_keys[stage_name])
+        if cached is not None:
+            console.print(f"[green]✓ Using cached section: {stage_name}[/green]")
+            results[index] = cached
+            continue
+        prompt, user_content = build_section_prompts(topic, stage_name, web_search_results, search_contexts.get(stage_name))
+        request_lines.append(json.dumps({
+            "custom_id": stage_name,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": OPENAI_MODEL,
+                "messages": [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": user_content}
+                ],
+                "max_tokens": 1500,
+                "temperature": 0.7,
+            },
+        }))
+
+    if not request_lines:
+        return results
+
+    try:
+        batch_input = await client.files.create(
+            file=("sections.jsonl", "\n".join(request_lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        console.print(f"[cyan]Submitted OpenAI batch {batch.id} with {len(request_lines)} sections.[/cyan]")
+
+        # Poll until the batch reaches a terminal state, backing off between checks
+        delay = BATCH_POLL_INITIAL
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if progress_callback:
+                counts = batch.request_counts
+                done = f" ({counts.completed}/{counts.total} done)" if counts else ""
+                progress_callback(start_progress, "OpenAI Batch", "Batch Agent", f"Batch {batch.status}{done}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX)
+            batch = await client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise OpenAIError(f"OpenAI batch {batch.id} finished with status '{batch.status}'.")
+
+        output = await client.files.content(batch.output_file_id)
+        responses = {}
+        for line in output.text.splitlines():
+            if line.strip():
+                record = json.loads(line)
+                responses[record["custom_id"]] = record
+    except OpenAIError:
+        raise
+    except Exception as e:
+        error_message = f"OpenAI Batch API error: {str(e)}"
+        console.print(f"[red]{error_message}[/red]")
+        raise OpenAIError(error_message) from e
+
+    # Map the responses back to their stages by custom_id
+    for index, (stage, _) in enumerate(stage_plan):
+        stage_name = stage.name
+        if results[index] is not None:
+            continue
+        record = responses.get(stage_name)
+        response = (record or {}).get("response") or {}
+        if not record or record.get("error") or response.get("status_code") != 200:
+            error = (record or {}).get("error") or "missing from batch output"
+            results[index] = OpenAIError(f"Batch request for '{stage_name}' failed: {error}")
+            continue
+        content = response["body"]["choices"][0]["message"]["content"].strip()
+        _store_cached_section(cache_keys[stage_name], content)
+        results[index] = content
+    return results
+
+
+# Search queries in flight at once when --stage-search runs one search per stage
+try:
+    WEB_SEARCH_CONCURRENCY = max(1, int(os.getenv("WEB_SEARCH_CONCURRENCY", "4")))
+except ValueError:
+    console.print("[yellow]⚠ WEB_SEARCH_CONCURRENCY must be a whole number; using 4.[/yellow]")
+    WEB_SEARCH_CONCURRENCY = 4
+
+
+async def _run_web_searches(search_provider, topic: str, stages: Tuple[Stage, ...], limit: int = 10):
+    """Run the topic search, plus one focused search per stage with --stage-search.
+
+    Returns (topic results, {stage name: results}). Without --stage-search every
+    stage shares the topic results. A stage whose own search fails or comes back
+    empty falls back to the topic results; a failed topic search raises.
+    """
+    queries = [topic]
+    if STAGE_SEARCH_MODE:
+        queries += [f"{topic} {convert_stage_to_title(stage.name)}" for stage in stages]
+    semaphore = asyncio.Semaphore(WEB_SEARCH_CONCURRENCY)
+
+    async def search(query: str):
+        async with semaphore:
+            return await search_provider.search_async(query, limit=limit)
+
+    # The topic query is started first, so it gets the first slot
+    results = await asyncio.gather(*(search(query) for query in queries), return_exceptions=True)
+    topic_results = results[0]
+    if isinstance(topic_results, BaseException):
+        raise topic_results
+
+    search_results_by_stage = {}
+    for stage, stage_results in itertools.zip_longest(stages, results[1:]):
+        if isinstance(stage_results, BaseException):
+            console.print(f"[yellow]⚠ Search for '{stage.name}' failed: {str(stage_results)}. Using topic results.[/yellow]")
+            stage_results = None
+        search_results_by_stage[stage.name] = stage_results or topic_results
+    return topic_results, search_results_by_stage
+
+
+# Closing block appended to every generated report
+REPORT_METHODOLOGY = """
+
+## Methodology
+This market research report was prepared using a multi-faceted research methodology:
+* **AI Model Synthesis:** Leveraging advanced language models (OpenAI GPT and/or Anthropic Claude) for analysis, data interpretation, and content generation based on provided context and training data.
+* **Real-time Data Enrichment (Optional):** Incorporation of current web search results via Brave Search API to enhance timeliness and relevance.
+* **Structured Analysis Framework:** Following a defined sequence of research stages, including market trends, competitive landscape, target audience, market sizing, growth potential, and risk assessment.
+* **Expert Prompts:** Utilizing specialized prompts designed to elicit detailed and relevant information for each research section.
+
+## Disclaimer
+This report is generated with AI assistance. While efforts are made to ensure accuracy, the information is based on the AI models' knowledge up to their last training cut-off and real-time search data (if used). All data, insights, and recommendations should be independently verified before making critical business decisions.
+"""
+
+
+# Providers each model strategy needs; balanced needs whichever ones its stages prefer
+_REQUIRED_PROVIDERS: Dict[str, Tuple[str, ...]] = {
+    "openai": ("openai",),
+    "claude": ("claude",),
+    "balanced": tuple(provider for provider, used in (("openai", _STAGE_USES_OPENAI), ("claude", _STAGE_USES_CLAUDE)) if used),
+}
+VALID_MODEL_PREFERENCES = frozenset(_REQUIRED_PROVIDERS)
+# provider -> (display name, has an API key, client is usable, reason when the key is set but the client is not)
+_PROVIDER_CHECKS: Dict[str, Tuple[str, Callable[[], bool], Callable[[], bool], str]] = {
+    "openai": ("OpenAI", lambda: bool(OPENAI_API_KEY), lambda: True, ""),
+    "claude": ("Claude", lambda: bool(CLAUDE_API_KEY), ensure_claude_client,
+               "the 'anthropic' library is missing, failed to initialize or is too old. Please install or upgrade it."),
+}
+
+
+def _model_preference_error(model_preference: str) -> Optional[str]:
+    """Return why a model strategy can't run with the current configuration, or None if it can."""
+    if model_preference not in VALID_MODEL_PREFERENCES:
+        return f"Unknown model preference '{model_preference}'."
+    for provider in _REQUIRED_PROVIDERS[model_preference]:
+        name, has_key, client_ready, client_problem = _PROVIDER_CHECKS[provider]
+        if model_preference == provider:
+            context = f"{name} model preference selected"
+        else:
+            context = f"Balanced mode requires {name} for some stages"
+        if not has_key():
+            return f"{context}, but {name} API Key is not configured."
+        if not client_ready():
+            return f"{context}, but {client_problem}"
+    return None
+
+
+def generate_market_research_report(topic: str, progress_callback=None, model_preference="balanced", use_web_search=False, use_batch=False,
+                                    single_call=False, extra_content: Optional[str] = None,
+                                    search_results: Optional[Tuple[List[Dict[str, str]], Dict[str, List[Dict[str, str]]]]] = None) -> Optional[str]:
     """
     Generate a comprehensive market research report on the given topic.
     Uses the OpenAI and/or Claude APIs based on preference. Fails strictly if the chosen model encounters an error.
 
     Args:
         topic: The market research topic
-        progress_callback: Optional callback function to report progress
+        progress_callback: Optional callback function to report progress, called as
+            (percentage, stage, agent, activity); while sections stream it also gets
+            new_words, the number of words received since its last call
         model_preference: The preferred model strategy ("balanced", "openai", or "claude")
         use_web_search: Whether to use web search
+        use_batch: Submit all sections as one OpenAI Batch API job (OpenAI strategy only)
+        single_call: Generate all sections with one model request instead of one per stage
+        extra_content: Markdown inserted after the generated sections, before the Methodology
+        search_results: (topic results, per-stage results) from an earlier attempt; when
+            given, the web search is not repeated
 
     Returns:
         str: Markdown formatted report if successful.
         None: If generation fails due to model error or configuration issues.
+
+    Raises:
+        TransientReportError: If every failed section failed on a transient API error
     """
     try:
+        # --- Model Availability Pre-checks based on Preference ---
+        config_error = _model_preference_error(model_preference)
+        if config_error:
+            console.print(f"[bold red]Error: {config_error}[/bold red]")
+            return None # Fail early
+
+        # --- Report Sections ---
+        # Slot 0 is the header, 1..N the stage sections in order, then the caller's extra
+        # content and the methodology
+        report_sections: List[Optional[str]] = [None] * (len(STAGES) + 3)
+        topic_title = topic.title() # Used in the header and status messages
+        # Create the header using format_report (Rust or Python version)
+        try:
+            # The format_report function is already imported at the top level
+            # and handles both Python and Rust implementations
+            console.print(f"[cyan]Generating report header for {topic_title}...[/cyan]")
+            report_header = format_report("", topic_title)
+            report_sections[0] = report_header
+        except Exception as e:
+            console.print(f"[bold red]Error generating report header: {str(e)}[/bold red]")
+            console.print_exception(show_locals=False)
+            console.print("[bold yellow]Aborting report generation.[/bold yellow]")
+            return None
+
+        # --- Whole-report cache ---
+        # Re-running a topic with the same options reuses the generated sections,
+        # skipping the web search and every model call. The header is always fresh.
+        report_cache_key = None
+        cached_body = None
+        if response_cache is not None:
+            report_cache_key = make_cache_key(
+                kind="report",
+                topic=topic.strip().lower(),
+                model_preference=model_preference,
+                use_web_search=bool(use_web_search),
+                stage_search=bool(use_web_search) and STAGE_SEARCH_MODE,
+                single_call=bool(single_call),
+                models=[OPENAI_MODEL, CLAUDE_MODEL],
+                stages=[stage.name for stage in STAGES],
+            )
+            cached_body = response_cache.get(report_cache_key)
+            if cached_body is not None:
+                console.print(f"[green]✓ Reusing the cached report for {topic_title}[/green]")
+        # A near-identical topic ("EV market" vs "electric vehicle market") can reuse a
+        # whole report too, when its sections were not grounded in web search results
+        report_semantic_entry = None
+        if report_cache_key is not None and cached_body is None and not use_web_search:
+            report_model = f"report:{model_preference}:{OPENAI_MODEL}:{CLAUDE_MODEL}" + (":single" if single_call else "")
+            report_semantic_entry = _run_async(_semantic_cache_entry(report_model, topic, "Full Report"))
+            cached_body = _get_semantic_section(report_semantic_entry, "Full Report")
+        if cached_body is not None:
+            report_sections[1:-2] = [cached_body] + [""] * (len(STAGES) - 1)
+            return _finalize_report(report_sections, extra_content, progress_callback)
+
         # --- Web Search Logic ---
+        # Searched once the configuration checks pass, so a misconfigured run
+        # does not spend search queries
         web_search_results = []
-        if use_web_search and WEB_SEARCH_AVAILABLE:
+        search_results_by_stage: Dict[str, List[Dict[str, str]]] = {}
+        if search_results is not None:
+            web_search_results, search_results_by_stage = search_results
+        elif use_web_search and WEB_SEARCH_AVAILABLE:
             try:
                 if progress_callback:
                     progress_callback(5, "Web Search", "Search Agent", "Querying Brave Search API")
 
-                search_provider = get_search_provider("brave") # Assumes this function exists
-                web_search_results = search_provider.search(topic, limit=10)
+                search_provider = get_search_provider("brave", get_shared_http_client())
+                web_search_results, search_results_by_stage = _run_async(_run_web_searches(search_provider, topic, STAGES))
 
                 if progress_callback:
                     progress_callback(10, "Web Search", "Search Agent", "Processing search results")
@@ -818,249 +1978,82 @@ def generate_market_research_report(topic: str, progress_callback=None, model_pr
         elif use_web_search and not WEB_SEARCH_AVAILABLE:
              console.print("[yellow]⚠ Web search requested but module is not available.[/yellow]")
 
-
-        # --- Stages Definition ---
-        stages = [
-            {
-                "name": "Analyzing market trends",
-                "agent": "Agent 001: Market Analyst",
-                "activities": [
-                    "Gathering historical market data", "Identifying emerging trends",
-                    "Analyzing growth patterns", "Evaluating market adoption cycles"
-                ],
-                "preferred_model": "openai" # Default model preference
-            },
-            {
-                "name": "Gathering competitor data",
-                "agent": "Agent 002: Competitive Intelligence",
-                "activities": [
-                    "Identifying key market players", "Analyzing competitor strengths/weaknesses",
-                    "Mapping competitive positioning", "Evaluating market share"
-                ],
-                "preferred_model": "claude"
-            },
-            {
-                "name": "Identifying target audience",
-                "agent": "Agent 003: Demographics Specialist",
-                "activities": [
-                    "Segmenting customer base", "Analyzing demographic patterns",
-                    "Identifying key customer personas", "Mapping customer journey"
-                ],
-                "preferred_model": "openai"
-            },
-            {
-                "name": "Evaluating market size",
-                "agent": "Agent 004: Market Sizing Expert",
-                "activities": [
-                    "Calculating TAM", "Determining SAM",
-                    "Analyzing regional distribution", "Projecting penetration rates"
-                ],
-                "preferred_model": "claude"
-            },
-            {
-                "name": "Analyzing growth potential",
-                "agent": "Agent 005: Growth Strategist",
-                "activities": [
-                    "Identifying market opportunities", "Evaluating expansion potential",
-                    "Analyzing growth constraints", "Forecasting growth scenarios"
-                ],
-                "preferred_model": "openai"
-            },
-            {
-                "name": "Identifying risks and challenges",
-                "agent": "Agent 006: Risk Assessor",
-                "activities": [
-                    "Analyzing regulatory landscape", "Identifying entry barriers",
-                    "Evaluating competitive threats", "Assessing tech disruption risks"
-                ],
-                "preferred_model": "claude"
-            },
-            {
-                "name": "Generating recommendations",
-                "agent": "Agent 007: Strategic Advisor",
-                "activities": [
-                    "Synthesizing key findings", "Formulating strategic recommendations",
-                    "Prioritizing action items", "Developing implementation roadmap"
-                ],
-                "preferred_model": "openai"
-            },
-             { # Changed "Finalizing report" to "Executive Summary" generation stage
-                "name": "Generating Executive Summary", # Renamed stage
-                "agent": "Agent 008: Report Compiler",
-                "activities": [
-                    "Reviewing all sections", "Identifying key takeaways",
-                    "Drafting concise summary", "Formatting summary"
-                ],
-                "preferred_model": "claude" # Or OpenAI, depending on desired style
-            }
-        ]
-
-        # --- Model Availability Pre-checks based on Preference ---
-        openai_needed = model_preference == "openai" or \
-                        (model_preference == "balanced" and any(s.get("preferred_model") == "openai" for s in stages))
-        claude_needed = model_preference == "claude" or \
-                       (model_preference == "balanced" and any(s.get("preferred_model") == "claude" for s in stages))
-
-        if model_preference == "openai" and not OPENAI_API_KEY:
-            console.print("[bold red]Error: OpenAI model preference selected, but OpenAI API Key is not configured.[/bold red]")
-            return None # Fail early
-        if model_preference == "claude":
-            if not CLAUDE_API_KEY:
-                 console.print("[bold red]Error: Claude model preference selected, but Claude API Key is not configured.[/bold red]")
-                 return None
-            if not CLAUDE_AVAILABLE:
-                 console.print("[bold red]Error: Claude model preference selected, but 'anthropic' library is not installed or failed to initialize.[/bold red]")
-                 return None
-            # Check if Messages API is usable (important for Claude preference)
-            if not hasattr(claude_client, "messages") or not callable(getattr(claude_client.messages, "create", None)):
-                 console.print("[bold red]Error: Claude model preference selected, but installed 'anthropic' library is too old. Please upgrade.[/bold red]")
-                 return None
-
-        if model_preference == "balanced":
-            if openai_needed and not OPENAI_API_KEY:
-                 console.print("[bold red]Error: Balanced mode requires OpenAI for some stages, but OpenAI API Key is not configured.[/bold red]")
-                 return None
-            if claude_needed:
-                if not CLAUDE_API_KEY:
-                     console.print("[bold red]Error: Balanced mode requires Claude for some stages, but Claude API Key is not configured.[/bold red]")
-                     return None
-                if not CLAUDE_AVAILABLE:
-                     console.print("[bold red]Error: Balanced mode requires Claude for some stages, but 'anthropic' library is not installed or failed to initialize.[/bold red]")
-                     return None
-                # Check Messages API usability if Claude needed in balanced
-                if not hasattr(claude_client, "messages") or not callable(getattr(claude_client.messages, "create", None)):
-                     console.print("[bold red]Error: Balanced mode requires Claude, but installed 'anthropic' library is too old. Please upgrade.[/bold red]")
-                     return None
-
-        # --- Report Generation Loop ---
-        report_sections = []
-        # Create the header using format_report (Rust or Python version)
+        # Determine which model to STRICTLY use for each stage
+        if model_preference in ("openai", "claude"):
+            stage_models = (model_preference,) * len(STAGES)
+        elif model_preference == "balanced":
+            # Use stage preference directly - availability checked above
+            stage_models = _STAGE_MODEL_BALANCED
+        else: # Should not happen with UI, but handle defensively
+             console.print(f"[bold red]Internal Error: Unknown model preference '{model_preference}'. Aborting.[/bold red]")
+             return None
+        stage_plan = list(zip(STAGES, stage_models))
+
+        # --- Generate all sections concurrently (Strict Error Handling) ---
+        if use_batch and model_preference != "openai":
+            console.print("[bold red]Error: Batch mode is only available with the OpenAI model strategy.[/bold red]")
+            return None
+        # Adjust progress start point slightly if web search happened
+        start_progress = 10 if use_web_search else 0
+        if use_batch:
+            generate_sections = _generate_all_sections_batch
+        elif single_call:
+            generate_sections = _generate_all_sections_single_call
+        else:
+            generate_sections = _generate_all_sections
         try:
-            # The format_report function is already imported at the top level
-            # and handles both Python and Rust implementations
-            console.print(f"[cyan]Generating report header for {topic.title()}...[/cyan]")
-            report_header = format_report("", topic.title())
-            report_sections.append(report_header)
-        except Exception as e:
-            console.print(f"[bold red]Error generating report header: {str(e)}[/bold red]")
-            console.print_exception(show_locals=False)
+            section_results = _run_async(generate_sections(
+                topic,
+                stage_plan,
+                search_results_by_stage,
+                progress_callback,
+                start_progress,
+            ))
+        except (OpenAIError, ClaudeError, ConfigurationError) as e:
+            # Batch and single-request runs fail as a whole
+            console.print(f"[bold red]Failed to generate sections: {str(e)}[/bold red]")
+            if _caused_by_transient_api_error(e):
+                raise TransientReportError(str(e), (web_search_results, search_results_by_stage)) from e
             console.print("[bold yellow]Aborting report generation.[/bold yellow]")
             return None
 
-        for i, stage in enumerate(stages):
-            stage_name = stage["name"]
-            agent_name = stage["agent"]
-            activities = stage["activities"]
-
-            # Determine which model to STRICTLY use for this stage
-            model_to_use = None
-            stage_preferred = stage.get("preferred_model", "openai") # Default preference if missing
-
-            if model_preference == "openai":
-                model_to_use = "openai"
-            elif model_preference == "claude":
-                model_to_use = "claude"
-            elif model_preference == "balanced":
-                # Use stage preference directly - availability checked above
-                model_to_use = stage_preferred
-            else: # Should not happen with UI, but handle defensively
-                 console.print(f"[bold red]Internal Error: Unknown model preference '{model_preference}'. Aborting.[/bold red]")
-                 return None
-
-            # --- Progress Reporting ---
-            base_progress = (i / len(stages)) * 100
-            # Adjust progress start point slightly if web search happened
-            base_progress = max(10, base_progress) if use_web_search and i == 0 else base_progress
-            progress_per_activity = (1 / len(stages)) * (100 / len(activities))
-            if progress_callback:
-                # Report start of stage progress
-                progress_callback(base_progress, stage_name, agent_name, activities[0])
-
-            for j, activity in enumerate(activities):
-                # Simulate work / actual processing delay
-                time.sleep(0.2 + random.random() * 0.5 if is_rust_enabled else 0.4 + random.random() * 0.8) # Slightly faster simulation
-                activity_progress = base_progress + ((j + 1) / len(activities)) * (100 / len(stages)) # More accurate activity progress scaling
-                # Only cap progress at 99.9% if we're not on the last stage and last activity
-                if i < len(stages) - 1 or j < len(activities) - 1:
-                    activity_progress = min(activity_progress, 99.9) # Cap below 100 until final stage & activity
-                if progress_callback:
-                    progress_callback(activity_progress, stage_name, agent_name, activity)
-
-            # --- Generate Section Content (Strict Error Handling) ---
-            section_content = ""
-            try:
-                console.print(f"\n[bold]Generating section: '{stage_name}' using {model_to_use.upper()}...[/bold]")
-                if model_to_use == "claude":
-                     # Configuration should be okay based on pre-checks, but call can still fail
-                     section_content = generate_section_with_claude(topic, stage_name, web_search_results if use_web_search and web_search_results else None)
-                elif model_to_use == "openai":
-                     # Configuration should be okay based on pre-checks
-                     section_content = generate_section_with_openai(topic, stage_name, web_search_results if use_web_search and web_search_results else None)
-                else:
-                    # This case should be prevented by earlier checks
-                    raise ConfigurationError(f"Invalid model '{model_to_use}' determined for stage '{stage_name}'.")
+        # Regenerating only helps if nothing failed for a lasting reason (bad key, invalid request)
+        failures = [result for result in section_results if isinstance(result, BaseException)]
+        retryable = bool(failures) and all(_caused_by_transient_api_error(failure) for failure in failures)
 
-                section_title = convert_stage_to_title(stage_name)
-                # Add extra newline for spacing
-                report_sections.append(f"\n## {section_title}\n\n{section_content.strip()}\n")
-
-            except (OpenAIError, ClaudeError, ConfigurationError) as e:
+        for slot, ((stage, model_to_use), section_content) in enumerate(zip(stage_plan, section_results), 1):
+            stage_name = stage.name
+            if isinstance(section_content, (OpenAIError, ClaudeError, ConfigurationError)):
                 # Catch specific errors from generation functions or config issues during the call
                 console.print(f"[bold red]Failed to generate section: '{stage_name}' using {model_to_use.upper()}.[/bold red]")
                 # Error message should have been printed by the failing function too
-                console.print(f"[red]Reason: {str(e)}[/red]")
+                console.print(f"[red]Reason: {str(section_content)}[/red]")
+                if retryable:
+                    raise TransientReportError(str(section_content), (web_search_results, search_results_by_stage)) from section_content
                 console.print("[bold yellow]Aborting report generation.[/bold yellow]")
                 return None # Signal failure
-            except Exception as e:
-                 # Catch any other unexpected errors during the loop
-                 console.print(f"[bold red]An unexpected error occurred during stage '{stage_name}': {str(e)}[/bold red]")
-                 console.print_exception(show_locals=False) # Show traceback for debugging
+            if isinstance(section_content, BaseException):
+                 # Any other unexpected error raised while generating the stage
+                 console.print(f"[bold red]An unexpected error occurred during stage '{stage_name}': {str(section_content)}[/bold red]")
+                 console.print(Traceback.from_exception(type(section_content), section_content, section_content.__traceback__, show_locals=False)) # Show traceback for debugging
                  console.print("[bold yellow]Aborting report generation.[/bold yellow]")
                  return None # Signal failure
 
+            section_title = convert_stage_to_title(stage_name)
+            # Add extra newline for spacing
+            report_sections[slot] = f"\n## {section_title}\n\n{section_content.strip()}\n"
 
-        # --- Finalize Report (if loop completes successfully) ---
-        if progress_callback:
-            # Ensure 100% completion is reported
-            progress_callback(100, "Report completed", "System", "Finalizing document")
-
-        # Add Methodology/Appendix
-        report_sections.append(
-"""
-
-## Methodology
-This market research report was prepared using a multi-faceted research methodology:
-* **AI Model Synthesis:** Leveraging advanced language models (OpenAI GPT and/or Anthropic Claude) for analysis, data interpretation, and content generation based on provided context and training data.
-* **Real-time Data Enrichment (Optional):** Incorporation of current web search results via Brave Search API to enhance timeliness and relevance.
-* **Structured Analysis Framework:** Following a defined sequence of research stages, including market trends, competitive landscape, target audience, market sizing, growth potential, and risk assessment.
-* **Expert Prompts:** Utilizing specialized prompts designed to elicit detailed and relevant information for each research section.
-
-## Disclaimer
-This report is generated with AI assistance. While efforts are made to ensure accuracy, the information is based on the AI models' knowledge up to their last training cut-off and real-time search data (if used). All data, insights, and recommendations should be independently verified before making critical business decisions.
-"""
-)
-
-        full_report = "".join(report_sections)
-
-        # Clean any ANSI escape sequences that might be in the report
-        try:
-            # Always use the Python wrapper which has proper fallback handling
-            full_report = clean_escape_sequences(full_report)
-        except Exception as e:
-            console.print(f"[yellow]Warning: Could not use clean_escape_sequences: {str(e)}. Using direct regex.[/yellow]")
+        if report_cache_key is not None:
             try:
-                escape_seq_pattern = re.compile(r'(?:\x1B|\bESC)(?:\[|\(|\))[^@-Z\\^_`a-z{|}~]*[@-Z\\^_`a-z{|}~]')
-                full_report = escape_seq_pattern.sub('', full_report)
-            except Exception as inner_e:
-                console.print(f"[yellow]Warning: Could not clean escape sequences: {str(inner_e)}[/yellow]")
+                response_cache.set(report_cache_key, "".join(report_sections[1:-2]))
+            except Exception as e:
+                console.print(f"[yellow]⚠ Could not cache the report: {str(e)}[/yellow]")
+            _store_semantic_section(report_semantic_entry, topic, "".join(report_sections[1:-2]))
 
-        # Optional Rust final processing (if you implement specific formatting there)
-        if is_rust_enabled:
-            # Example: return process_markdown(full_report) # If Rust fn exists
-            return full_report # For now, just return
-        else:
-            return full_report
+        return _finalize_report(report_sections, extra_content, progress_callback)
 
+    except TransientReportError:
+        raise
     except Exception as e:
         # Catch errors during setup (e.g., initial web search, stage definition issues)
         console.print(f"[bold red]Error during report generation setup: {str(e)}[/bold red]")
@@ -1068,15 +2061,182 @@ This report is generated with AI assistance. While efforts are made to ensure ac
         return None # Signal failure
 
 
+def _finalize_report(report_sections: List[Optional[str]], extra_content: Optional[str], progress_callback=None) -> str:
+    """
+    Append the extra content and methodology to a report's header and sections and clean the result.
+    
+    Args:
+        report_sections: Header, stage sections, and two trailing slots filled here
+        extra_content: Markdown inserted after the generated sections, before the Methodology
+        progress_callback: Optional progress callback, told the report is complete
+        
+    Returns:
+        str: The finished Markdown report
+    """
+    if progress_callback:
+        # Ensure 100% completion is reported
+        progress_callback(100, "Report completed", "System", "Finalizing document")
+
+    # Add Methodology/Appendix
+    report_sections[-2] = extra_content or ""
+    report_sections[-1] = REPORT_METHODOLOGY
+
+    full_report = "".join(report_sections)
+
+    # Clean any ANSI escape sequences that might be in the report
+    try:
+        # Always use the Python wrapper which has proper fallback handling
+        full_report = clean_escape_sequences(full_report)
+    except Exception as e:
+        console.print(f"[yellow]Warning: Could not use clean_escape_sequences: {str(e)}. Using direct regex.[/yellow]")
+        try:
+            full_report = _strip_escape_sequences(full_report)
+        except Exception as inner_e:
+            console.print(f"[yellow]Warning: Could not clean escape sequences: {str(inner_e)}[/yellow]")
+
+    # Rust-specific final processing (e.g. process_markdown) would go here; both paths
+    # currently return the cleaned report as is
+    return full_report
+
+
 # --- CLI Class ---
 
+def _update_env_vars(updates: Dict[str, str], env_path: Path = ENV_FILE) -> None:
+    """
+    Set several KEY=value pairs in the .env file in one rewrite, then in os.environ.
+    
+    The file is copied line by line into a temp file beside it, replacing each
+    key's line (or appending one), and swapped in with os.replace so a crash
+    never leaves a half-written .env.
+    
+    Args:
+        updates: Environment variable names mapped to their new values
+        env_path: .env file to update (created if missing)
+    """
+    if not updates:
+        return
+    pending = dict(updates)
+    fd, tmp_path = tempfile.mkstemp(dir=env_path.parent, prefix=".env.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            if env_path.exists():
+                with open(env_path, "r", encoding="utf-8") as src:
+                    for line in src:
+                        key = line.split("=", 1)[0] if "=" in line else None
+                        if key in updates:
+                            tmp.write(f"{key}={updates[key]}\n")
+                            pending.pop(key, None)
+                        else:
+                            tmp.write(line if line.endswith("\n") else line + "\n")
+            for key, value in pending.items():
+                tmp.write(f"{key}={value}\n")
+        os.replace(tmp_path, env_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    os.environ.update(updates)
+
+def _update_env_var(key: str, value: str, env_path: Path = ENV_FILE) -> None:
+    """Set a single KEY=value in the .env file and os.environ (see _update_env_vars)."""
+    _update_env_vars({key: value}, env_path)
+
+def _mask(value: Optional[str]) -> str:
+    """Mask a secret for display, keeping its first and last four characters."""
+    if not value:
+        return "Not set"
+    if len(value) > 8:
+        return value[:4] + "*" * (len(value) - 8) + value[-4:]
+    return "*" * len(value)
+
+@dataclass(frozen=True)
+class SettingsStatus:
+    """Configuration state shown by the Settings menu; equal snapshots render the same."""
+    openai_key: bool
+    claude_key: bool
+    claude_library: bool
+    brave_key: bool
+    web_search: bool
+    twilio_library: bool
+    twilio_enabled: bool
+
+def _settings_snapshot() -> SettingsStatus:
+    """Capture the current configuration state (library checks use find_spec, not imports)."""
+    return SettingsStatus(
+        openai_key=bool(os.getenv("OPENAI_API_KEY")),
+        claude_key=bool(os.getenv("ANTHROPIC_API_KEY")),
+        claude_library=CLAUDE_LIBRARY_INSTALLED,
+        brave_key=bool(os.getenv("BRAVE_API_KEY")),
+        web_search=WEB_SEARCH_AVAILABLE,
+        twilio_library=TWILIO_AVAILABLE,
+        twilio_enabled=bool(TWILIO_ENABLED),
+    )
+
+@functools.lru_cache(maxsize=8)
+def _render_settings_status(status: SettingsStatus) -> Table:
+    """Build the Settings status table, once per distinct snapshot."""
+    def mark(ok: bool) -> str:
+        return "✅" if ok else "❌"
+    table = Table(title="Current Configuration", show_header=False, box=None)
+    table.add_column("Status")
+    table.add_column("Setting", style="bold")
+    table.add_column("Note", style="dim")
+    table.add_row(mark(status.openai_key), "OpenAI API Key", "")
+    table.add_row(mark(status.claude_key and status.claude_library), "Claude API Key",
+                  "" if status.claude_library else "anthropic library not installed")
+    table.add_row(mark(status.brave_key and status.web_search), "Brave Search API Key",
+                  "" if status.web_search else "web_search module unavailable")
+    table.add_row(mark(status.twilio_enabled), "SMS (Twilio)",
+                  "" if status.twilio_library else "twilio library not installed")
+    return table
+
+class SettingsChoice(Enum):
+    """Settings menu entries; the value is the label shown to the user."""
+    API_KEYS = "Configure API Keys"
+    SMS = "Configure SMS Settings"
+    CLEAR_CACHE = "Clear Response Cache"
+    BACK = "Return to Main Menu"
+
+@functools.lru_cache(maxsize=8)
+def _settings_choice_specs(status: SettingsStatus) -> Tuple[Tuple[str, SettingsChoice, Optional[str]], ...]:
+    """Return the Settings menu's (title, value, disabled reason) entries for a configuration state."""
+    disabled = {
+        SettingsChoice.SMS: None if status.twilio_enabled else "Twilio credentials not configured",
+        SettingsChoice.CLEAR_CACHE: None if RESPONSE_CACHE_AVAILABLE else "response cache unavailable",
+    }
+    return tuple((option.value, option, disabled.get(option)) for option in SettingsChoice)
+
+
+def _settings_choices(status: SettingsStatus) -> List["questionary.Choice"]:
+    """Build fresh Settings menu choices; questionary writes shortcut keys onto Choice objects."""
+    return [questionary.Choice(title=title, value=value, disabled=reason)
+            for title, value, reason in _settings_choice_specs(status)]
+
+# Dashboard avatar for each agent, keyed by the part of its name before the colon
+AGENT_EMOJI = {"Agent 001": "👨‍💻","Agent 002": "👩‍💼","Agent 003": "🧑‍🔬", # Emojis
+               "Agent 004": "📚","Agent 005": "🧠","Agent 006": "🔎",
+               "Agent 007": "📊","Agent 008": "📝", "System": "⚙️", "Search Agent": "🌐"}
+
+
 class FastCLI:
     """A command-line interface for market research generation with Rust acceleration."""
 
+    # Size of the precomputed noise buffers for the dashboard stats (a power of two)
+    _NOISE_SIZE = 4096
+
     def __init__(self):
         """Initialize the CLI."""
         # Use Rust or Python tracker based on availability
         self.tracker = ProgressTracker() if is_rust_enabled else BasicProgressTracker()
+        # Jitter for the simulated stats and log sampling, drawn once and read with a
+        # rolling index so progress callbacks don't call the RNG
+        rng = random.Random()
+        self._noise_words = [rng.randint(-100, 100) for _ in range(self._NOISE_SIZE)]
+        self._noise_data = [rng.randint(-3, 3) for _ in range(self._NOISE_SIZE)]
+        self._log_roll = [rng.random() < 0.15 for _ in range(self._NOISE_SIZE)]
+        self._noise_index = 0
 
     def display_welcome(self):
         """Display a welcome message and API status."""
@@ -1098,14 +2258,15 @@ class FastCLI:
             console.print("❌ [bold red]OpenAI:[/bold red] API Key Not Found (Set OPENAI_API_KEY in .env)")
 
         if CLAUDE_API_KEY:
-            if CLAUDE_AVAILABLE:
-                 # Further check for Messages API usability
-                 if hasattr(claude_client, "messages") and callable(getattr(claude_client.messages, "create", None)):
-                      console.print("✅ [bold cyan]Claude:[/bold cyan] API Key Found & Library OK (Messages API detected)")
-                 else:
-                      console.print("⚠️ [bold yellow]Claude:[/bold yellow] API Key Found, but Library too old (Messages API missing). Run: pip install --upgrade anthropic")
+            # The library is imported (and the Messages API checked) when Claude is first used
+            if CLAUDE_READY:
+                 console.print("✅ [bold cyan]Claude:[/bold cyan] API Key Found & Client ready")
+            elif _claude_init_attempted:
+                 console.print("⚠️ [bold yellow]Claude:[/bold yellow] API Key Found, but the client failed to initialize or the 'anthropic' library is too old. Run: pip install --upgrade anthropic")
+            elif CLAUDE_LIBRARY_INSTALLED:
+                 console.print("✅ [bold cyan]Claude:[/bold cyan] API Key Found & Library installed")
             else:
-                 console.print("⚠️ [bold yellow]Claude:[/bold yellow] API Key Found, but 'anthropic' library NOT installed or failed init. Run: pip install anthropic")
+                 console.print("⚠️ [bold yellow]Claude:[/bold yellow] API Key Found, but 'anthropic' library NOT installed. Run: pip install anthropic")
         else:
             console.print("❌ [bold red]Claude:[/bold red] API Key Not Found (Set ANTHROPIC_API_KEY in .env)")
 
@@ -1193,6 +2354,11 @@ class FastCLI:
 
     def generate_report(self) -> None:
         """Guides user through report generation options and initiates the process."""
+        from rich.layout import Layout
+        from rich.live import Live
+        from rich.panel import Panel
+        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
         # --- Report Generation Banner ---
         report_banner = """
     ╔═══════════════════════════════════════════════════╗
@@ -1273,13 +2439,9 @@ class FastCLI:
         model_options = []
         # Determine available options based on configured keys AND libraries
         openai_is_usable = bool(OPENAI_API_KEY)
-        # Claude usability check (key, library installed, and Messages API capability)
-        claude_is_usable = (
-             bool(CLAUDE_API_KEY) and
-             CLAUDE_AVAILABLE and
-             hasattr(claude_client, "messages") and
-             callable(getattr(claude_client.messages, "create", None))
-        )
+        # Claude usability check (key, library installed, and Messages API capability);
+        # validated once per process and cached in CLAUDE_READY
+        claude_is_usable = CLAUDE_READY or ensure_claude_client()
 
         if openai_is_usable and claude_is_usable:
             model_options.extend([
@@ -1311,6 +2473,15 @@ class FastCLI:
         elif "Claude Only" in model_selection:
             model_preference = "claude"
 
+        # Batch API Option (OpenAI only)
+        use_batch = False
+        if model_preference == "openai":
+            use_batch = questionary.confirm(
+                "Submit via OpenAI Batch API? (50% cheaper, may take up to 24h)",
+                default=OPENAI_BATCH_DEFAULT
+            ).ask()
+            if use_batch is None: return
+
         # --- Generation Process with Live Display (Modified Error Handling) ---
         console.print(f"\n[bold]Generating market research report on: [green]{topic}[/green] (using {model_preference} strategy)[/bold]\n")
 
@@ -1325,53 +2496,52 @@ class FastCLI:
         )
 
         # Log messages, stats - Keep your definitions
-        log_messages = []
+        log_messages = deque(maxlen=6) # Oldest lines fall off as new ones arrive
         report_stats = {"sections_completed": 0, "words_generated": 0, "data_points": 0, "charts": 0}
         spinner_frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
         spinner_idx = 0
         current_model_display = "N/A" # For display
         
-        # Define the display-only version of stages for UI updates
-        # This is only used for UI display purposes, not for actual report generation
-        display_stages = [
-            {"name": "Analyzing market trends", "preferred_model": "openai"},
-            {"name": "Gathering competitor data", "preferred_model": "claude"},
-            {"name": "Identifying target audience", "preferred_model": "openai"},
-            {"name": "Evaluating market size", "preferred_model": "claude"},
-            {"name": "Analyzing growth potential", "preferred_model": "openai"},
-            {"name": "Identifying risks and challenges", "preferred_model": "claude"},
-            {"name": "Generating recommendations", "preferred_model": "openai"},
-            {"name": "Generating Executive Summary", "preferred_model": "claude"}
-        ]
+        # Stage counts and model tags come from STAGES, the same definitions used for generation
 
         # Define progress update callback (keep existing logic, maybe add model info)
-        def update_progress(percentage, stage, agent, activity):
-            nonlocal current_model_display # Allow modification
+        streamed_words = 0 # Words actually received from the models so far
+        last_tick = (-1.0, None) # (percentage, stage) of the last full update
+
+        def update_progress(percentage, stage, agent, activity, new_words=0):
+            nonlocal current_model_display, streamed_words, last_tick # Allow modification
+            streamed_words += new_words
             self.tracker.update(percentage, stage, agent, activity)
 
+            # Streaming ticks arrive every few dozen words; unless progress moved a full
+            # point or the stage changed, the word count above is all that needs updating
+            if stage == last_tick[1] and percentage - last_tick[0] < 1.0:
+                if streamed_words:
+                    report_stats["words_generated"] = streamed_words
+                return
+            last_tick = (percentage, stage)
+
             # Determine which model is likely being used for display purposes
             # Note: This is just for display, the actual model used is determined in generate_market_research_report
-            stage_pref = "openai" # Find the stage pref if needed for display
-            for s in display_stages: # Use the local display_stages instead of the global stages
-                 if s["name"] == stage:
-                      stage_pref = s.get("preferred_model", "openai")
-                      break
+            stage_pref = _STAGE_PREFERRED_MODEL.get(stage, "openai")
 
             if model_preference == "openai": current_model_display = "OpenAI"
             elif model_preference == "claude": current_model_display = "Claude"
             else: current_model_display = stage_pref.capitalize() # Balanced uses stage pref
 
+            self._noise_index = i = (self._noise_index + 1) & (self._NOISE_SIZE - 1)
+
             # Simulate stats updates (keep existing logic)
             if stage != "Initializing":
-                 report_stats["sections_completed"] = int((percentage / 100) * len(display_stages)) # Use display_stages length
-                 report_stats["words_generated"] = int((percentage / 100) * 2500) + random.randint(-100, 100)
-                 report_stats["data_points"] = int((percentage / 100) * 45) + random.randint(-3, 3)
+                 report_stats["sections_completed"] = int((percentage / 100) * len(STAGES))
+                 # Show the real streamed word count once text is arriving
+                 report_stats["words_generated"] = streamed_words or int((percentage / 100) * 2500) + self._noise_words[i]
+                 report_stats["data_points"] = int((percentage / 100) * 45) + self._noise_data[i]
                  report_stats["charts"] = int((percentage / 100) * 7) # Placeholder
 
             # Add log messages (keep existing logic)
-            if random.random() < 0.15 and percentage < 99:
-                 log_messages.append(f"[{datetime.now().strftime('%H:%M:%S')}] {agent}: {activity[:50]}...")
-                 if len(log_messages) > 6: log_messages.pop(0)
+            if self._log_roll[i] and percentage < 99:
+                 log_messages.append(f"[{time.strftime('%H:%M:%S')}] {agent}: {activity[:50]}...")
 
         # Start the live display
         report_content = None
@@ -1382,120 +2552,129 @@ class FastCLI:
              with Live(layout, refresh_per_second=10, console=console) as live:
                   live_display_active = True # Mark live display as active
 
-                  # Define display update thread (keep existing layout/formatting logic)
-                  def update_display_thread():
+                  # Draw one frame of the dashboard (keep existing layout/formatting logic)
+                  def render_display():
                        nonlocal spinner_idx
-                       while live_display_active: # Use flag to control loop
-                            progress_data = self.tracker.get_progress()
-                            percentage = progress_data["percentage"]
-                            stage = progress_data["stage"]
-                            agent = progress_data["agent"]
-                            activity = progress_data["activity"]
-                            elapsed = progress_data["elapsed_seconds"]
-
-                            # Header
-                            spinner_idx = (spinner_idx + 1) % len(spinner_frames)
-                            spinner = spinner_frames[spinner_idx]
-                            accel = "[Rust]" if is_rust_enabled else "[Py]"
-                            model_tag = f"[{current_model_display}]"
-                            header_text = f"[bold blue]{spinner} Generating: [green]{topic}[/green] {accel} {model_tag}[/bold blue]\n"
-                            header_text += f"[cyan]Focus: {', '.join(research_focus) if research_focus != ['All of the above'] else 'Comprehensive'}[/cyan] | "
-                            header_text += f"[cyan]Detail: {report_length}[/cyan]"
-                            layout["header"].update(Panel(header_text, border_style="blue"))
-
-                            # Stats
-                            stats_text = f"[b]Sections:[/b] {report_stats['sections_completed']}/{len(display_stages)} | [b]Words:[/b] ~{report_stats['words_generated']} | [b]Data:[/b] {report_stats['data_points']} | [b]Charts:[/b] {report_stats['charts']}"
-                            layout["stats"].update(Text.from_markup(stats_text))
-
-                            # Progress Bar
-                            # ... (keep your progress bar logic) ...
-                            progress_text = Text.from_markup(f"[bold]{percentage:.1f}%[/bold] | Elapsed: [b]{int(elapsed)}s[/b]")
-                            bar_width = 60
-                            filled = int((percentage / 100) * bar_width)
-                            bar = "[" + "■" * filled + "□" * (bar_width - filled) + "]"
-                            progress_bar = Text(bar, style="bold green" if percentage > 70 else ("bold yellow" if percentage > 30 else "bold red"))
-                            layout["progress"].update(Panel.fit(progress_text + "\n" + progress_bar, title="Progress", border_style="blue"))
-
-
-                            # Agents
-                            # ... (keep your agent display logic) ...
-                            agents = {"Agent 001": "👨‍💻","Agent 002": "👩‍💼","Agent 003": "🧑‍🔬", # Emojis
-                                      "Agent 004": "📚","Agent 005": "🧠","Agent 006": "🔎",
-                                      "Agent 007": "📊","Agent 008": "📝", "System": "⚙️", "Search Agent": "🌐"}
-                            agent_avatar = agents.get(agent.split(":")[0].strip(), "🤖")
-                            agent_text = f"[b]Stage:[/b] {stage}\n[b]Agent:[/b] {agent_avatar} {agent}\n[b]Activity:[/b] {activity}"
-                            layout["agents"].update(Panel(agent_text, title="Active Agents", border_style="green"))
-
-
-                            # Log
-                            log_text = "\n".join(log_messages) if log_messages else "Initializing..."
-                            layout["log"].update(Panel(log_text, title="Activity Log", border_style="yellow"))
-
-                            # Exit condition for thread
-                            if percentage >= 100 or generation_failed:
-                                 time.sleep(0.5) # Allow final update to show
-                                 break # Exit loop
-
-                            time.sleep(0.1) # Refresh rate
-
-                  # Start display thread
-                  display_thread = threading.Thread(target=update_display_thread, daemon=True)
-                  display_thread.start()
-
-                  # --- Start the actual report generation ---
-                  report_content = generate_market_research_report(
-                       topic, update_progress, model_preference, use_web_search
-                  )
-
-                  # --- Check for Failure ---
-                  if report_content is None:
-                       generation_failed = True
-                       # Error message printed by generate_market_research_report
-                       console.print("\n[bold red]Report generation failed due to model or configuration error.[/bold red]")
-                       # Stop live display and thread before exiting 'with' block
-                       live_display_active = False
-                       display_thread.join(timeout=1.0) # Wait briefly for thread exit
-                       live.stop() # Explicitly stop live display
-                       return # Exit generate_report method
-
-                  # --- Add Custom Content (Only if successful) ---
+                       progress_data = self.tracker.get_progress()
+                       percentage = progress_data["percentage"]
+                       stage = progress_data["stage"]
+                       agent = progress_data["agent"]
+                       activity = progress_data["activity"]
+                       elapsed = progress_data["elapsed_seconds"]
+
+                       # Header
+                       spinner_idx = (spinner_idx + 1) % len(spinner_frames)
+                       spinner = spinner_frames[spinner_idx]
+                       accel = "[Rust]" if is_rust_enabled else "[Py]"
+                       model_tag = f"[{current_model_display}]"
+                       header_text = f"[bold blue]{spinner} Generating: [green]{topic}[/green] {accel} {model_tag}[/bold blue]\n"
+                       header_text += f"[cyan]Focus: {', '.join(research_focus) if research_focus != ['All of the above'] else 'Comprehensive'}[/cyan] | "
+                       header_text += f"[cyan]Detail: {report_length}[/cyan]"
+                       layout["header"].update(Panel(header_text, border_style="blue"))
+
+                       # Stats
+                       stats_text = f"[b]Sections:[/b] {report_stats['sections_completed']}/{len(STAGES)} | [b]Words:[/b] ~{report_stats['words_generated']} | [b]Data:[/b] {report_stats['data_points']} | [b]Charts:[/b] {report_stats['charts']}"
+                       layout["stats"].update(Text.from_markup(stats_text))
+
+                       # Progress Bar
+                       # ... (keep your progress bar logic) ...
+                       progress_text = Text.from_markup(f"[bold]{percentage:.1f}%[/bold] | Elapsed: [b]{int(elapsed)}s[/b]")
+                       bar_width = 60
+                       filled = int((percentage / 100) * bar_width)
+                       bar = "[" + "■" * filled + "□" * (bar_width - filled) + "]"
+                       progress_bar = Text(bar, style="bold green" if percentage > 70 else ("bold yellow" if percentage > 30 else "bold red"))
+                       layout["progress"].update(Panel.fit(progress_text + "\n" + progress_bar, title="Progress", border_style="blue"))
+
+
+                       # Agents
+                       # ... (keep your agent display logic) ...
+                       agent_avatar = AGENT_EMOJI.get(agent.partition(":")[0].rstrip(), "🤖")
+                       agent_text = f"[b]Stage:[/b] {stage}\n[b]Agent:[/b] {agent_avatar} {agent}\n[b]Activity:[/b] {activity}"
+                       layout["agents"].update(Panel(agent_text, title="Active Agents", border_style="green"))
+
+
+                       # Log
+                       log_text = "\n".join(log_messages) if log_messages else "Initializing..."
+                       layout["log"].update(Panel(log_text, title="Activity Log", border_style="yellow"))
+
+                  # Refresh from a task on the shared event loop, so drawing interleaves with
+                  # the section requests instead of competing with them from another thread
+                  async def refresh_display():
+                       while True:
+                            render_display()
+                            await asyncio.sleep(0.1) # Refresh rate
+
+                  def stop_display():
+                       nonlocal live_display_active
+                       if live_display_active:
+                            live_display_active = False
+                            refresh_task.cancel()
+                            _run_async(asyncio.gather(refresh_task, return_exceptions=True))
+                            render_display() # Final frame
+
+                  refresh_task = _get_event_loop().create_task(refresh_display())
+
+                  # --- Custom Content, placed before the Methodology section ---
+                  custom_section_content = None
                   if custom_queries or (research_focus and "All of the above" not in research_focus):
-                      custom_section_content = "\n\n---\n" # Separator
+                      custom_parts = ["\n\n---\n"] # Separator
                       if research_focus and "All of the above" not in research_focus:
-                           custom_section_content += "\n## Focused Analysis Areas\n"
+                           custom_parts.append("\n## Focused Analysis Areas\n")
                            for focus in research_focus:
-                                custom_section_content += f"\n### {focus}\n\n"
+                                custom_parts.append(f"\n### {focus}\n\n")
                                 # Placeholder - ideally, this would trigger focused re-generation or synthesis
-                                custom_section_content += f"*(Detailed analysis focusing on {focus.lower()} for the {topic} market would be presented here.)*\n"
+                                custom_parts.append(f"*(Detailed analysis focusing on {focus.lower()} for the {topic} market would be presented here.)*\n")
 
                       if custom_queries:
-                           custom_section_content += "\n## Custom Query Responses\n"
+                           custom_parts.append("\n## Custom Query Responses\n")
                            for query in custom_queries:
-                                custom_section_content += f"\n### Query: {query}\n\n"
+                                custom_parts.append(f"\n### Query: {query}\n\n")
                                 # Placeholder - AI would answer this based on generated report
-                                custom_section_content += "*(AI-generated response addressing this specific query based on the market analysis would be presented here.)*\n"
+                                custom_parts.append("*(AI-generated response addressing this specific query based on the market analysis would be presented here.)*\n")
+                      custom_section_content = "".join(custom_parts)
 
-                      # Append before Methodology
-                      appendix_pos = report_content.find("\n## Methodology")
-                      if appendix_pos != -1:
-                           report_content = report_content[:appendix_pos] + custom_section_content + report_content[appendix_pos:]
-                      else:
-                           report_content += custom_section_content
+                  # --- Start the actual report generation ---
+                  # Only transient API failures are retried; other failures return None at once
+                  search_results = None
+                  for attempt in range(1, REPORT_GENERATION_ATTEMPTS + 1):
+                       try:
+                            report_content = generate_market_research_report(
+                                 topic, update_progress, model_preference, use_web_search, use_batch, SINGLE_CALL_MODE,
+                                 extra_content=custom_section_content, search_results=search_results
+                            )
+                            break
+                       except TransientReportError as e:
+                            report_content = None
+                            if attempt == REPORT_GENERATION_ATTEMPTS:
+                                 break
+                            # Reuse this attempt's search results rather than querying again
+                            search_results = e.search_results
+                            delay = 2 ** attempt
+                            console.print(f"[yellow]Report generation failed; retrying in {delay}s (attempt {attempt + 1}/{REPORT_GENERATION_ATTEMPTS})...[/yellow]")
+                            # Wait on the event loop so the dashboard's refresh task keeps running
+                            _run_async(asyncio.sleep(delay))
 
+                  # --- Check for Failure ---
+                  if report_content is None:
+                       generation_failed = True
+                       # Error message printed by generate_market_research_report
+                       console.print("\n[bold red]Report generation failed due to model or configuration error.[/bold red]")
+                       # Stop live display before exiting 'with' block
+                       stop_display()
+                       live.stop() # Explicitly stop live display
+                       return # Exit generate_report method
 
                   # Ensure progress hits 100% if successful
                   if not generation_failed and self.tracker.get_progress()["percentage"] < 100:
                        update_progress(100, "Report completed", "System", "Finalizing document")
 
-                  # Wait for display thread to finish naturally
-                  live_display_active = False # Signal thread to stop
-                  display_thread.join(timeout=2.0) # Wait for clean exit
+                  stop_display()
 
         except Exception as e:
              # Catch unexpected errors outside the generation loop but within 'with Live'
              generation_failed = True
              if live_display_active:
-                  live_display_active = False
+                  stop_display()
                   if 'live' in locals(): live.stop() # Stop if possible
              console.print(f"\n[bold red]An unexpected critical error occurred: {str(e)}[/bold red]")
              console.print_exception(show_locals=False)
@@ -1504,11 +2683,8 @@ class FastCLI:
         finally:
              # Ensure live is stopped if an error occurred before or during context exit
              if live_display_active and 'live' in locals():
-                  live_display_active = False
+                  stop_display()
                   live.stop()
-             # Ensure thread is joined if it's still running somehow
-             if 'display_thread' in locals() and display_thread.is_alive():
-                  display_thread.join(timeout=0.5)
 
 
         # === Post-Generation (Only runs if generation_failed is False) ===
@@ -1519,29 +2695,29 @@ class FastCLI:
 
         # --- Save Report ---
         console.print("\n[bold green]✓ Report generation completed successfully![/bold green]")
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        file_name = f"{topic.lower().replace(' ', '_').replace('/','_')}_{timestamp}.md"
-        file_path_str = None
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        file_name = f"{topic.translate(_FILENAME_TABLE).lower()}_{timestamp}.md"
+        console.print(f"[bold green]Saving report to:[/bold green] {REPORTS_DIR / file_name}")
         try:
-            file_path_str = report_manager.save_report(file_name, report_content)
-            console.print(f"[bold green]Report saved to:[/bold green] {file_path_str}")
+            file_path = Path(_save_report(file_name, report_content))
         except Exception as e:
             console.print(f"[bold red]Error saving report: {str(e)}[/bold red]")
+            file_path = None
+        save_failed = file_path is None
 
         # --- Completion Animation ---
         with Progress(
             SpinnerColumn(), TextColumn("[bold green]Finalizing..."), BarColumn(), TaskProgressColumn(), transient=True,
         ) as progress:
             task = progress.add_task("", total=100)
-            for i in range(101):
-                progress.update(task, completed=i)
-                time.sleep(0.01)
+            # Paint the finished bar once rather than animating it for a second
+            progress.update(task, completed=100)
+            progress.refresh()
 
         # --- Post-generation Options ---
         post_options = []
-        file_path = Path(file_path_str) if file_path_str else None
 
-        if file_path and file_path.exists():
+        if not save_failed:
             post_options.append("View the report")
             if TWILIO_ENABLED:
                 post_options.append("Send summary via SMS") # Clarify it's a summary
@@ -1554,7 +2730,7 @@ class FastCLI:
         ])
 
         prompt_message = "What would you like to do next?"
-        if not file_path:
+        if save_failed:
             prompt_message = "Report generated but failed to save. What next?"
 
         post_action = questionary.select(
@@ -1562,10 +2738,10 @@ class FastCLI:
             choices=post_options
         ).ask()
 
-        if post_action == "View the report" and file_path:
+        if post_action == "View the report":
             view_report(file_path, console) # Call standalone view function
-        elif post_action == "Send summary via SMS" and file_path:
-            self._send_report_sms(file_path)
+        elif post_action == "Send summary via SMS":
+            self._send_report_sms(file_path, report_content)
         elif post_action == "Configure SMS (Twilio)":
             self._configure_sms_settings()
         elif post_action == "Generate another report":
@@ -1576,7 +2752,8 @@ class FastCLI:
 
     def list_reports(self) -> None:
         """List all available reports."""
-        reports = report_manager.get_all_reports()
+        scanned = _cached_reports()
+        reports = [name for name, _ in scanned]
         
         if not reports:
             console.print("\n[bold yellow]No reports found.[/bold yellow]")
@@ -1588,21 +2765,9 @@ class FastCLI:
         report_details = []
         
         # Process each report to extract metadata
-        for i, report_filename in enumerate(reports, 1):
+        for i, (report_filename, st) in enumerate(scanned, 1):
             try:
-                report_path = REPORTS_DIR / report_filename
-                content = report_path.read_text(encoding='utf-8')
-                
-                # Parse metadata with compatibility handling
-                metadata_result = parse_report_metadata(content)
-                
-                # Handle both return types: Dict from Python implementation or (Dict, String) tuple from Rust
-                if isinstance(metadata_result, tuple) and len(metadata_result) == 2:
-                    # Rust implementation returns (metadata_dict, content_str)
-                    metadata = metadata_result[0]
-                else:
-                    # Python implementation returns just the metadata dict
-                    metadata = metadata_result
+                metadata = _get_report_metadata(report_filename, st.st_mtime_ns)
                 
                 title = metadata.get("title", report_filename)
                 date = metadata.get("date", "Unknown Date")
@@ -1650,7 +2815,7 @@ class FastCLI:
             ).ask()
             
             if choice:
-                self.view_report_by_index(int(choice))
+                self.view_report_by_index(int(choice) - 1)
 
     def view_report_by_index(self, index: int) -> None: # Kept for potential direct calling
         """View a specific report by its index from the last listing."""
@@ -1658,10 +2823,10 @@ class FastCLI:
         # It's generally better to re-list and select.
         # The implementation within list_reports is preferred.
         try:
-            reports = report_manager.get_all_reports()
+            reports = _cached_reports()
             if 0 <= index < len(reports):
-                report_filename = reports[index]
-                report_path = Path(REPORTS_DIR) / report_filename
+                report_filename = reports[index][0]
+                report_path = REPORTS_DIR / report_filename
                 view_report(report_path, console)
             else:
                  console.print("[red]Invalid report index.[/red]")
@@ -1671,7 +2836,8 @@ class FastCLI:
     def export_reports(self) -> None:
         """Export reports to PDF."""
         try:
-            reports = report_manager.get_all_reports()
+            scanned = _cached_reports()
+            reports = [name for name, _ in scanned]
         except Exception as e:
             console.print(f"[red]Error listing reports for export: {e}[/red]")
             return
@@ -1680,41 +2846,17 @@ class FastCLI:
             console.print("[yellow]No reports found to export.[/yellow]")
             return
         
-        # Check if PDF export is available - use try/except to detect reportlab
-        reportlab_available = False
-        try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.lib import colors
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-            from reportlab.lib.units import inch, cm
-            reportlab_available = True
+        # Check if PDF export is available; the exporter imports ReportLab itself when it uses it
+        if importlib.util.find_spec("reportlab") is not None:
             console.print("[green]ReportLab is available for PDF export.[/green]")
-        except ImportError:
+        else:
             console.print("[yellow]ReportLab library not found. PDF export will attempt to use alternatives.[/yellow]")
-            reportlab_available = False
             
         # Create a list of report options with index and title/date
         report_options = []
-        for i, report_filename in enumerate(reports):
+        for i, (report_filename, st) in enumerate(scanned):
             try:
-                content = report_manager.read_report(report_filename)
-                
-                # Clean escape sequences from content
-                try:
-                    content = clean_escape_sequences(content)
-                except Exception:
-                    # Continue without cleaning if it fails
-                    pass
-                
-                # Handle potential tuple return from parse_report_metadata
-                metadata_result = parse_report_metadata(content)
-                if isinstance(metadata_result, tuple) and len(metadata_result) == 2:
-                    # Rust implementation returns (metadata_dict, content_str)
-                    metadata = metadata_result[0]
-                else:
-                    # Python implementation returns just the metadata dict
-                    metadata = metadata_result
+                metadata = _get_report_metadata(report_filename, st.st_mtime_ns)
                     
                 title = metadata.get("title", report_filename).replace(" Market Analysis", "")
                 date = metadata.get("date", "Unknown Date")
@@ -1739,24 +2881,16 @@ class FastCLI:
             # Parse the index from the choice string (#X: ...)
             selection_idx = int(choice.split('#')[1].split(':')[0]) - 1
             report_filename = reports[selection_idx]
-            report_path = Path(REPORTS_DIR) / report_filename
+            report_path = REPORTS_DIR / report_filename
             self.export_single_report(report_path)
         except Exception as e:
             console.print(f"[red]Error exporting report: {e}[/red]")
     
     def export_single_report(self, report_path: Path) -> None:
         """Export a single report to PDF."""
-        # Check if PDF export is available
-        reportlab_available = False
-        try:
-            from reportlab.lib.pagesizes import A4
-            reportlab_available = True
-        except ImportError:
-            reportlab_available = False
-            
         try:
             # Read the report content
-            content = report_path.read_text(encoding='utf-8')
+            content = _read_report_cached(report_path)
             
             # Clean escape sequences from content
             try:
@@ -1799,7 +2933,8 @@ class FastCLI:
     def delete_report(self) -> None:
         """Allows the user to select and delete a report."""
         try:
-             reports = report_manager.get_all_reports()
+             scanned = _cached_reports()
+             reports = [name for name, _ in scanned]
         except Exception as e:
              console.print(f"[red]Error listing reports for deletion: {e}[/red]")
              return
@@ -1810,25 +2945,9 @@ class FastCLI:
 
         # Create a list of report options with index and title/date
         report_options = []
-        for i, report_filename in enumerate(reports):
+        for i, (report_filename, st) in enumerate(scanned):
             try:
-                content = report_manager.read_report(report_filename)
-                
-                # Clean escape sequences from content
-                try:
-                    content = clean_escape_sequences(content)
-                except Exception:
-                    # Continue without cleaning if it fails
-                    pass
-                
-                # Handle potential tuple return from parse_report_metadata
-                metadata_result = parse_report_metadata(content)
-                if isinstance(metadata_result, tuple) and len(metadata_result) == 2:
-                    # Rust implementation returns (metadata_dict, content_str)
-                    metadata = metadata_result[0]
-                else:
-                    # Python implementation returns just the metadata dict
-                    metadata = metadata_result
+                metadata = _get_report_metadata(report_filename, st.st_mtime_ns)
                     
                 title = metadata.get("title", report_filename).replace(" Market Analysis", "")
                 date = metadata.get("date", "Unknown Date")
@@ -1856,7 +2975,9 @@ class FastCLI:
             
             # Confirm deletion
             if questionary.confirm(f"Are you sure you want to delete '{report_filename}'?", default=False).ask():
-                if report_manager.delete_report(report_filename):
+                if get_report_manager().delete_report(report_filename):
+                    _REPORT_META_CACHE.pop(report_filename, None)
+                    _invalidate_reports_cache()
                     console.print(f"[green]Report '{report_filename}' deleted successfully.[/green]")
                 else:
                     console.print(f"[yellow]Failed to delete report '{report_filename}'.[/yellow]")
@@ -1865,15 +2986,21 @@ class FastCLI:
         except Exception as e:
             console.print(f"[red]Error during report deletion: {e}[/red]")
     
-    def _send_report_sms(self, report_path: Path) -> None:
-        """Send a summary of the report via SMS using Twilio."""
+    def _send_report_sms(self, report_path: Path, content: Optional[str] = None) -> None:
+        """Send a summary of the report via SMS using Twilio.
+        
+        Args:
+            report_path: Path to the saved report
+            content: Report text if the caller already has it in memory
+        """
         if not TWILIO_ENABLED:
             console.print("[red]Twilio is not configured. Cannot send SMS.[/red]")
             return
 
         try:
-            # Read the report content
-            content = report_path.read_text(encoding='utf-8')
+            # Read the report content unless the caller already has it
+            if content is None:
+                content = _read_report_cached(report_path)
             
             # Clean escape sequences from content
             try:
@@ -1881,12 +3008,7 @@ class FastCLI:
             except Exception as e:
                 console.print(f"[yellow]Warning: Error cleaning escape sequences: {e}[/yellow]")
                 # Apply direct cleaning if clean_escape_sequences fails
-                ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-                content = ansi_escape.sub('', content)
-                
-                # Also handle text representations of ESC
-                esc_text = re.compile(r'ESC\[(?:\d+;)*\d*[a-zA-Z]')
-                content = esc_text.sub('', content)
+                content = _strip_escape_sequences(content)
             
             # Extract title for SMS
             metadata_result = parse_report_metadata(content)
@@ -1897,11 +3019,14 @@ class FastCLI:
             
             title = metadata.get("title", report_path.stem)
             
-            # Prepare SMS message
-            sms_message = f"New market research report available: {title}\n\n{content}"
+            # Prepare SMS message from the Executive Summary (or the start of the report)
+            match = _EXEC_SUMMARY_RE.search(content)
+            summary_text = match.group(1).strip() if match else content.strip()
+            sms_message = f"New market research report available: {title}\n\n{summary_text[:SMS_SUMMARY_MAX_CHARS]}"
             
             # Send SMS using Twilio
             try:
+                from twilio.rest import Client as TwilioClient
                 client = TwilioClient(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
                 message = client.messages.create(
                     to=TWILIO_PHONE_NUMBER,
@@ -1916,6 +3041,7 @@ class FastCLI:
 
     def _configure_sms_settings(self) -> None:
         """Configure SMS settings using Twilio."""
+        global TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_PHONE_NUMBER
         if not TWILIO_ENABLED:
             console.print("[red]Twilio is not configured. Cannot configure SMS settings.[/red]")
             return
@@ -1924,7 +3050,7 @@ class FastCLI:
             # Get current settings
             current_settings = {
                 "Account SID": TWILIO_ACCOUNT_SID,
-                "Auth Token": TWILIO_AUTH_TOKEN,
+                "Auth Token": _mask(TWILIO_AUTH_TOKEN),
                 "Phone Number": TWILIO_PHONE_NUMBER
             }
             console.print("\n[bold]Current SMS Settings:[/bold]")
@@ -1933,21 +3059,19 @@ class FastCLI:
 
             # Ask user for new settings
             new_account_sid = questionary.text("Enter new Account SID (leave blank to keep current):", default=TWILIO_ACCOUNT_SID).ask()
-            new_auth_token = questionary.text("Enter new Auth Token (leave blank to keep current):", default=TWILIO_AUTH_TOKEN).ask()
+            # Masked and without a default, so the current token is never echoed
+            new_auth_token = questionary.password("Enter new Auth Token (leave blank to keep current):").ask()
             new_phone_number = questionary.text("Enter new Phone Number (leave blank to keep current):", default=TWILIO_PHONE_NUMBER).ask()
 
-            # Update settings if provided
-            if new_account_sid:
-                TWILIO_ACCOUNT_SID = new_account_sid
-            if new_auth_token:
-                TWILIO_AUTH_TOKEN = new_auth_token
-            if new_phone_number:
-                TWILIO_PHONE_NUMBER = new_phone_number
-
-            # Save settings to environment variables
-            os.environ["TWILIO_ACCOUNT_SID"] = TWILIO_ACCOUNT_SID
-            os.environ["TWILIO_AUTH_TOKEN"] = TWILIO_AUTH_TOKEN
-            os.environ["TWILIO_PHONE_NUMBER"] = TWILIO_PHONE_NUMBER
+            # Collect the changed settings and save them in a single .env rewrite
+            pending = {}
+            if new_account_sid and new_account_sid != TWILIO_ACCOUNT_SID:
+                pending["TWILIO_ACCOUNT_SID"] = TWILIO_ACCOUNT_SID = new_account_sid
+            if new_auth_token and new_auth_token != TWILIO_AUTH_TOKEN:
+                pending["TWILIO_AUTH_TOKEN"] = TWILIO_AUTH_TOKEN = new_auth_token
+            if new_phone_number and new_phone_number != TWILIO_PHONE_NUMBER:
+                pending["TWILIO_PHONE_NUMBER"] = TWILIO_PHONE_NUMBER = new_phone_number
+            _update_env_vars(pending)
 
             console.print("\n[bold green]SMS settings updated successfully![/bold green]")
         except Exception as e:
@@ -1965,19 +3089,18 @@ class FastCLI:
     def settings(self) -> None:
         """Configure application settings."""
         console.print("\n[bold blue]===== Settings Menu =====[/bold blue]")
+        status = _settings_snapshot()
+        console.print(_render_settings_status(status))
         
-        # Define available settings options
-        settings_options = [
-            "Configure API Keys",
-            "Configure SMS Settings",
-            "Return to Main Menu"
-        ]
+        # Choices carry the enum member, so dispatch doesn't depend on the label text;
+        # the numbered fallback below follows the same order
+        settings_options = list(SettingsChoice)
         
         # Display settings menu using questionary
         try:
             choice = questionary.select(
                 "What would you like to configure?",
-                choices=settings_options,
+                choices=_settings_choices(status),
                 qmark=">",
                 use_indicator=True,
                 use_shortcuts=True,
@@ -1987,43 +3110,48 @@ class FastCLI:
             console.print(f"[yellow]Warning: Interactive selection failed: {str(e)}[/yellow]")
             # Fallback to simple input
             for i, option in enumerate(settings_options, 1):
-                console.print(f"  {i}. {option}")
-            console.print("Enter the number of your choice (1-3): ", end="")
+                console.print(f"  {i}. {option.value}")
+            console.print(f"Enter the number of your choice (1-{len(settings_options)}): ", end="")
             user_input = input().strip()
-            if user_input.isdigit() and 1 <= int(user_input) <= 3:
+            if user_input.isdigit() and 1 <= int(user_input) <= len(settings_options):
                 choice = settings_options[int(user_input) - 1]
             else:
                 console.print("[red]Invalid input. Returning to main menu.[/red]")
                 return
         
         # Handle user choice
-        if choice == "Configure API Keys" or choice == "1":
-            self._configure_api_keys()
-        elif choice == "Configure SMS Settings" or choice == "2":
-            self._configure_sms_settings()
-        elif choice == "Return to Main Menu" or choice == "3":
+        actions = {
+            SettingsChoice.API_KEYS: self._configure_api_keys,
+            SettingsChoice.SMS: self._configure_sms_settings,
+            SettingsChoice.CLEAR_CACHE: self._clear_response_cache,
+        }
+        if choice in actions:
+            actions[choice]()
+        elif choice == SettingsChoice.BACK:
             console.print("[green]Returning to main menu...[/green]")
+    
+    def _clear_response_cache(self) -> None:
+        """Discard cached model responses so the next report is generated fresh."""
+        if response_cache is None and semantic_cache is None:
+            console.print("[yellow]Response caching is not enabled.[/yellow]")
             return
+        if response_cache is not None:
+            response_cache.clear()
+        if semantic_cache is not None:
+            semantic_cache.clear()
+        console.print("[green]Response cache cleared.[/green]")
     
     def _configure_api_keys(self) -> None:
         """Configure API keys for OpenAI, Claude, and Brave Search."""
         console.print("\n[bold]API Key Configuration[/bold]")
         
         # Display current API keys (masked for security)
-        current_keys = {
-            "OpenAI API Key": os.getenv("OPENAI_API_KEY", "Not set"),
-            "Claude API Key": os.getenv("ANTHROPIC_API_KEY", "Not set"),
-            "Brave Search API Key": os.getenv("BRAVE_API_KEY", "Not set")
+        masked_keys = {
+            "OpenAI API Key": _mask(os.getenv("OPENAI_API_KEY")),
+            "Claude API Key": _mask(os.getenv("ANTHROPIC_API_KEY")),
+            "Brave Search API Key": _mask(os.getenv("BRAVE_API_KEY"))
         }
         
-        # Mask keys for display
-        masked_keys = {}
-        for key_name, key_value in current_keys.items():
-            if key_value != "Not set" and len(key_value) > 8:
-                masked_keys[key_name] = key_value[:4] + "*" * (len(key_value) - 8) + key_value[-4:]
-            else:
-                masked_keys[key_name] = key_value
-        
         console.print("\n[bold]Current API Keys:[/bold]")
         for key_name, masked_value in masked_keys.items():
             icon = "✅" if masked_value != "Not set" else "❌"
@@ -2071,47 +3199,32 @@ class FastCLI:
         
         # Update environment variable and .env file
         try:
-            # Update in-memory environment variable
-            os.environ[env_var_name] = new_value
-            
-            # Update .env file if it exists
-            env_file = Path(".env")
-            if env_file.exists():
-                env_contents = env_file.read_text()
-                
-                # Check if variable exists in file
-                if f"{env_var_name}=" in env_contents:
-                    # Replace existing value
-                    line_pattern = re.compile(f"^{env_var_name}=.*$", re.MULTILINE)
-                    new_contents = line_pattern.sub(f"{env_var_name}={new_value}", env_contents)
-                else:
-                    # Add new variable at the end
-                    new_contents = env_contents.rstrip() + f"\n{env_var_name}={new_value}\n"
-                
-                # Write updated content back to file
-                env_file.write_text(new_contents)
+            # Update the .env file (creating it if needed) and the in-memory environment
+            env_existed = ENV_FILE.exists()
+            _update_env_var(env_var_name, new_value)
+            if env_existed:
                 console.print(f"[green]✓ {key_choice} updated successfully![/green]")
             else:
-                # Create new .env file
-                env_file.write_text(f"{env_var_name}={new_value}\n")
                 console.print(f"[green]✓ {key_choice} set and .env file created![/green]")
                 
             # If this is OpenAI or Claude, let's notify about model availability change
             if env_var_name == "OPENAI_API_KEY":
-                global OPENAI_API_KEY
+                global OPENAI_API_KEY, openai_client
                 OPENAI_API_KEY = new_value
+                # Drop the shared client so it is rebuilt with the new key on next use
+                openai_client = None
                 console.print("[green]✓ OpenAI models are now available.[/green]")
             elif env_var_name == "ANTHROPIC_API_KEY":
                 # Reinitialize Claude client
-                if CLAUDE_AVAILABLE:
-                    global CLAUDE_API_KEY, claude_client
+                if CLAUDE_LIBRARY_INSTALLED:
+                    global CLAUDE_API_KEY, _claude_init_attempted
                     CLAUDE_API_KEY = new_value
                     # Attempt to reinitialize claude client
-                    try:
-                        claude_client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
+                    _claude_init_attempted = False
+                    if ensure_claude_client():
                         console.print("[green]✓ Claude models are now available.[/green]")
-                    except Exception as e:
-                        console.print(f"[yellow]⚠ Could not initialize Claude client: {str(e)}[/yellow]")
+                    else:
+                        console.print("[yellow]⚠ Could not initialize Claude client.[/yellow]")
                 else:
                     console.print("[yellow]⚠ Claude API library ('anthropic') not installed. Claude models unavailable despite key update.[/yellow]")
             
@@ -2133,7 +3246,7 @@ def view_report(report_path: Path, console: Any) -> None:
         return
 
     try:
-        content = report_path.read_text(encoding='utf-8')
+        content = _read_report_cached(report_path)
         
         # Clean any ANSI escape sequences in the content
         try:
@@ -2141,12 +3254,7 @@ def view_report(report_path: Path, console: Any) -> None:
         except Exception as e:
             console.print(f"[yellow]Warning: Error cleaning escape sequences: {str(e)}[/yellow]")
             # Apply direct cleaning if clean_escape_sequences fails
-            ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-            content = ansi_escape.sub('', content)
-            
-            # Also handle text representations of ESC
-            esc_text = re.compile(r'ESC\[(?:\d+;)*\d*[a-zA-Z]')
-            content = esc_text.sub('', content)
+            content = _strip_escape_sequences(content)
         
         # Extract title for display
         metadata_result = parse_report_metadata(content)
@@ -2182,17 +3290,19 @@ def view_report(report_path: Path, console: Any) -> None:
 if __name__ == "__main__":
     print("=== Debug: Starting application ===")
     try:
-        # Don't call app() directly, which causes Typer error
-        # Instead, create a CLI instance and start interactive mode
+        # Create a CLI instance and start interactive mode
         print("=== Debug: Creating CLI instance ===")
         cli_instance = FastCLI()
         print("=== Debug: Displaying welcome ===")
         cli_instance.display_welcome()
         print("=== Debug: Entering main menu ===")
         cli_instance.main_menu()
+        close_shared_http_client()
         print("=== Debug: Application completed normally ===")
     except Exception as e:
-        print(f"=== Debug: Unhandled exception: {e} ===")
+        # Fatal path: write straight to stderr (no Rich rendering) and exit non-zero
+        sys.stderr.write(f"=== Debug: Unhandled exception: {e} ===\n")
         import traceback
         traceback.print_exc()
+        sys.exit(1)
     print("=== Debug: Reached end of file ===")
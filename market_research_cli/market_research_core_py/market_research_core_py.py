@@ -9,29 +9,39 @@ import os
 import json
 import time
 import datetime
-import re
 import subprocess
 import tempfile
 import shutil
 import platform
 import io
+import functools
+import importlib.util
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 
-# Try to import reportlab for pure Python PDF generation
+# The escape pattern is shared with the CLI; this module is imported both from the
+# repository root and from inside market_research_cli/
 try:
-    print("Attempting to import ReportLab modules...")
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib import colors
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-    from reportlab.lib.units import inch, cm
-    REPORTLAB_AVAILABLE = True
-    print("✅ Successfully imported ReportLab modules, REPORTLAB_AVAILABLE =", REPORTLAB_AVAILABLE)
-except ImportError as e:
-    REPORTLAB_AVAILABLE = False
-    print(f"❌ Failed to import ReportLab: {e}")
-    print("ReportLab is not available for PDF generation.")
+    from market_research_cli.escape_sequences import clean_escape_sequences as _strip_escape_sequences
+except ImportError:
+    from escape_sequences import clean_escape_sequences as _strip_escape_sequences
+
+# The PDF backends are only imported when a report is exported; at import time we
+# just check that ReportLab is installed
+REPORTLAB_AVAILABLE = importlib.util.find_spec("reportlab") is not None
+
+
+@functools.lru_cache(maxsize=1)
+def _weasyprint_html():
+    """Return WeasyPrint's HTML class, or None if it cannot be loaded.
+
+    WeasyPrint also needs Pango at the system level, which surfaces as OSError on import.
+    """
+    try:
+        from weasyprint import HTML
+        return HTML
+    except (ImportError, OSError):
+        return None
 
 # Try to import the Rust module, use Python fallbacks if not available
 try:
@@ -280,36 +290,11 @@ def clean_escape_sequences(content: str) -> str:
         return clean_escape_sequences_python(content)
 
 def clean_escape_sequences_python(content: str) -> str:
-    """Python implementation of escape sequence cleaning with comprehensive patterns"""
-    import re
-    
-    # Try multiple pattern replacements for thoroughness
-    
-    # Pattern 1: Standard ANSI escape sequences with ESC prefix
-    content = re.sub(r'ESC\[(\d+;)*\d*m', '', content)
-    
-    # Pattern 2: Raw escape character followed by color/formatting codes
-    content = re.sub(r'\x1B\[([0-9]{1,2}(;[0-9]{1,2})*)?[m|K|G|A|B|C|D|H|J|s|u|h|l]', '', content)
-    
-    # Pattern 3: Literal "ESC[" with formatting codes
-    content = re.sub(r'ESC\[([0-9]{1,2}(;[0-9]{1,2})*)?[m|K|G|A|B|C|D|H|J|s|u|h|l]', '', content)
-    
-    # Pattern 4: Additional formats like ESC[1;33m
-    content = re.sub(r'ESC\[\d+;\d+m', '', content)
-    
-    # Pattern 5: Simple ESC[0m pattern (reset)
-    content = re.sub(r'ESC\[0m', '', content)
-    
-    # Pattern 6: Bold and similar formats
-    content = re.sub(r'ESC\[1m', '', content)
-    
-    # Pattern 7: Other common ANSI formats
-    content = re.sub(r'ESC\[\d+m', '', content)
-    
-    # Pattern 8: Catch-all for other escape sequences with bracketed parameters
-    content = re.sub(r'(?:\x1B|\bESC)(?:\[|\(|\))[^@-Z\\^_`a-z{|}~]*[@-Z\\^_`a-z{|}~]', '', content)
-    
-    return content 
+    """Python implementation of escape sequence cleaning"""
+    # Most reports contain no escapes at all; two substring scans are far cheaper than the regex
+    if '\x1b' not in content and 'ESC' not in content:
+        return content
+    return _strip_escape_sequences(content)
 
 try:
     from market_research_core_py import (
@@ -343,42 +328,22 @@ def export_to_pdf(content: str, output_path: str) -> str:
     else:
         return export_to_pdf_python(content, output_path)
 
-def export_to_pdf_python(content: str, output_path: str) -> str:
-    """Python fallback for PDF export using wkhtmltopdf or reportlab"""
-    # Clean any escape sequences
-    cleaned_content = clean_escape_sequences_python(content)
-    
-    # Check if wkhtmltopdf is available
-    wkhtmltopdf_available = False
+def _markdown_to_html_document(cleaned_content: str) -> str:
+    """Render report markdown as a styled standalone HTML document for PDF conversion"""
+    # Convert markdown to HTML
     try:
-        subprocess.run(['wkhtmltopdf', '--version'], 
-                      check=True, 
-                      stdout=subprocess.PIPE, 
-                      stderr=subprocess.PIPE)
-        wkhtmltopdf_available = True
-    except (subprocess.SubprocessError, FileNotFoundError):
-        wkhtmltopdf_available = False
+        import markdown
+        html_content = markdown.markdown(
+            cleaned_content, 
+            extensions=['tables', 'fenced_code', 'codehilite']
+        )
+    except ImportError:
+        # Basic fallback if markdown module not available
+        html_content = cleaned_content.replace('\n', '<br>')
+        html_content = f"<pre>{html_content}</pre>"
     
-    # If wkhtmltopdf is available, use it (better quality)
-    if wkhtmltopdf_available:
-        # Create temp HTML file
-        with tempfile.NamedTemporaryFile(suffix='.html', delete=False, mode='w', encoding='utf-8') as f:
-            temp_html_path = f.name
-            
-            # Convert markdown to HTML
-            try:
-                import markdown
-                html_content = markdown.markdown(
-                    cleaned_content, 
-                    extensions=['tables', 'fenced_code', 'codehilite']
-                )
-            except ImportError:
-                # Basic fallback if markdown module not available
-                html_content = cleaned_content.replace('\n', '<br>')
-                html_content = f"<pre>{html_content}</pre>"
-            
-            # Add CSS styling
-            full_html = f"""<!DOCTYPE html>
+    # Add CSS styling
+    full_html = f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -443,6 +408,32 @@ def export_to_pdf_python(content: str, output_path: str) -> str:
     {html_content}
 </body>
 </html>"""
+    return full_html
+
+def export_to_pdf_python(content: str, output_path: str) -> str:
+    """Python fallback for PDF export using WeasyPrint, wkhtmltopdf or reportlab"""
+    # Clean any escape sequences
+    cleaned_content = clean_escape_sequences_python(content)
+    
+    # Check if wkhtmltopdf is on PATH (a lookup, rather than spawning it to print its version)
+    wkhtmltopdf_available = shutil.which('wkhtmltopdf') is not None
+    
+    # Prefer an in-process renderer, then wkhtmltopdf (better quality than ReportLab)
+    weasy_html = _weasyprint_html()
+    if weasy_html is not None or wkhtmltopdf_available:
+        full_html = _markdown_to_html_document(cleaned_content)
+    
+    if weasy_html is not None:
+        # Renders without a temp file or a wkhtmltopdf process launch per export
+        try:
+            weasy_html(string=full_html, base_url='.').write_pdf(output_path)
+        except Exception as e:
+            raise RuntimeError(f"Failed to convert to PDF: {e}")
+    
+    elif wkhtmltopdf_available:
+        # Create temp HTML file
+        with tempfile.NamedTemporaryFile(suffix='.html', delete=False, mode='w', encoding='utf-8') as f:
+            temp_html_path = f.name
             f.write(full_html)
         
         # Convert HTML to PDF
@@ -471,6 +462,11 @@ def export_to_pdf_python(content: str, output_path: str) -> str:
     # If wkhtmltopdf not available but reportlab is, use it
     elif REPORTLAB_AVAILABLE:
         print("Using ReportLab for PDF generation (wkhtmltopdf not found)")
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib import colors
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib.units import inch, cm
         
         # First, try to convert any HTML to plain text
         # ReportLab's parser can't handle complex HTML attributes like aria-hidden
@@ -504,13 +500,11 @@ def export_to_pdf_python(content: str, output_path: str) -> str:
         if cleaned_content.startswith('---'):
             end_marker = cleaned_content.find('---', 3)
             if end_marker != -1:
-                yaml_part = cleaned_content[3:end_marker].strip()
-                try:
-                    import yaml
-                    metadata = yaml.safe_load(yaml_part)
-                    cleaned_content = cleaned_content[end_marker+3:].strip()
-                except:
-                    pass
+                for line in cleaned_content[3:end_marker].splitlines():
+                    key, sep, value = line.partition(":")
+                    if sep:
+                        metadata[key.strip()] = value.strip().strip("'\"")
+                cleaned_content = cleaned_content[end_marker+3:].strip()
         
         # Try to find title from metadata or first heading
         if metadata and 'title' in metadata:
@@ -684,16 +678,18 @@ def export_to_pdf_python(content: str, output_path: str) -> str:
         doc.build(elements)
     
     else:
-        # If neither wkhtmltopdf nor reportlab is available, raise an error with installation instructions
+        # If no PDF backend is available, raise an error with installation instructions
         raise RuntimeError(
-            "Unable to generate PDF: wkhtmltopdf not found and reportlab is not installed.\n\n"
+            "Unable to generate PDF: weasyprint and reportlab are not installed and wkhtmltopdf was not found.\n\n"
             "Please install one of the following:\n"
             "1. wkhtmltopdf (recommended):\n"
             "   - macOS: brew install wkhtmltopdf\n"
             "   - Ubuntu/Debian: sudo apt-get install wkhtmltopdf\n"
             "   - Windows: Download from https://wkhtmltopdf.org/downloads.html\n\n"
             "2. ReportLab (alternative):\n"
-            "   - pip install reportlab\n"
+            "   - pip install reportlab\n\n"
+            "3. WeasyPrint (in-process, needs Pango):\n"
+            "   - pip install weasyprint\n"
         )
     
     # Check if PDF was created
@@ -0,0 +1,16 @@
+from .response_cache import ResponseCache, make_cache_key
+
+# The semantic layer needs numpy; the exact-match cache works without it
+try:
+    from .semantic_cache import SemanticCache
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SemanticCache = None
+    SEMANTIC_CACHE_AVAILABLE = False
+
+__all__ = [
+    'ResponseCache',
+    'make_cache_key',
+    'SemanticCache',
+    'SEMANTIC_CACHE_AVAILABLE'
+]
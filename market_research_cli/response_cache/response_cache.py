@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+# Default lifetime of a cached model response, in seconds
+DEFAULT_TTL = 86400
+
+
+def make_cache_key(**parts: Any) -> str:
+    """
+    Build a stable cache key from the parameters that determine a response.
+    
+    Args:
+        **parts: JSON-serialisable values (model, prompt inputs, sampling settings, ...)
+        
+    Returns:
+        Hex BLAKE2b digest of the canonical JSON encoding of the parts
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=32).hexdigest()
+
+
+class ResponseCache:
+    """Persistent exact-match cache for generated model responses, backed by SQLite."""
+    
+    def __init__(self, cache_dir: Path, default_ttl: int = DEFAULT_TTL):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            cache_dir: Directory that holds the cache database
+            default_ttl: Lifetime of new entries in seconds
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.default_ttl = default_ttl
+        self._conn = sqlite3.connect(self.cache_dir / "responses.sqlite3", check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.prune()
+    
+    def prune(self) -> int:
+        """
+        Drop expired responses so the database does not grow without bound.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Key produced by make_cache_key
+            
+        Returns:
+            The cached text, or None if missing or expired
+        """
+        row = self._conn.execute(
+            "SELECT value FROM responses WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+    
+    def set(self, key: str, value: str, expire: Optional[int] = None) -> None:
+        """
+        Store a response.
+        
+        Args:
+            key: Key produced by make_cache_key
+            value: Response text
+            expire: Lifetime in seconds (defaults to the cache's default_ttl)
+        """
+        ttl = self.default_ttl if expire is None else expire
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl)
+            )
+    
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._conn:
+            self._conn.execute("DELETE FROM responses")
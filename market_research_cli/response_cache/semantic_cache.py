@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .response_cache import ResponseCache, make_cache_key
+
+# FAISS is optional; without it the (small) per-section matrices are searched with numpy
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Minimum cosine similarity for a cached response to be reused
+DEFAULT_THRESHOLD = 0.92
+# Most topics kept per namespace; the oldest are dropped beyond this
+DEFAULT_MAX_ENTRIES = 256
+
+
+class SemanticCache:
+    """Similarity cache for generated responses, matched on topic embeddings.
+
+    Entries live in namespaces (e.g. one per model and section type) so a hit can
+    only come from the same kind of request; within a namespace the nearest stored
+    topic is returned if its cosine similarity clears the threshold.
+
+    Only the embeddings are kept here. The responses themselves are stored in a
+    ResponseCache, and entries expire with the same TTL as the rows there.
+    """
+
+    def __init__(self, store: ResponseCache, threshold: float = DEFAULT_THRESHOLD,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Load (or start) the semantic cache.
+
+        Args:
+            store: Response cache that holds the response text
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Most topics kept per namespace
+        """
+        self.store = store
+        self.path = store.cache_dir / "semantic_vectors.npz"
+        self.threshold = threshold
+        self.max_entries = max_entries
+        # namespace -> (unit vectors, topics, expiry times)
+        self._entries: Dict[str, Tuple[np.ndarray, List[str], np.ndarray]] = {}
+        self._indexes: Dict[str, "faiss.Index"] = {}
+        if self.path.exists():
+            self._load()
+            if any(self._prune(namespace) for namespace in list(self._entries)):
+                self._save()
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        """Return the embedding as a float32 unit vector."""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _response_key(namespace: str, topic: str) -> str:
+        """Return the response cache key for a namespace's topic."""
+        return make_cache_key(kind="semantic", namespace=namespace, topic=topic)
+
+    def _prune(self, namespace: str) -> bool:
+        """Drop a namespace's expired entries; return True if any were removed."""
+        vectors, topics, expires = self._entries[namespace]
+        live = expires > time.time()
+        if live.all():
+            return False
+        if not live.any():
+            del self._entries[namespace]
+        else:
+            self._entries[namespace] = (vectors[live], [t for t, keep in zip(topics, live) if keep], expires[live])
+        self._indexes.pop(namespace, None)
+        return True
+
+    def get(self, namespace: str, embedding: Sequence[float]) -> Optional[Tuple[str, str, float]]:
+        """
+        Find the closest cached response in a namespace.
+
+        Args:
+            namespace: Request kind the response must match
+            embedding: Embedding of the new request's topic
+
+        Returns:
+            (response, cached topic, similarity) on a hit, otherwise None
+        """
+        if namespace in self._entries:
+            self._prune(namespace)
+        entry = self._entries.get(namespace)
+        if entry is None:
+            return None
+        vectors, topics, _ = entry
+        query = self._normalize(embedding)
+        if query.shape[0] != vectors.shape[1]:
+            return None  # Embedding model changed since these were stored
+
+        if FAISS_AVAILABLE:
+            index = self._indexes.get(namespace)
+            if index is None:
+                index = faiss.IndexFlatIP(vectors.shape[1])
+                index.add(vectors)
+                self._indexes[namespace] = index
+            scores, ids = index.search(query.reshape(1, -1), 1)
+            best, score = int(ids[0][0]), float(scores[0][0])
+        else:
+            similarities = vectors @ query
+            best = int(np.argmax(similarities))
+            score = float(similarities[best])
+
+        if score < self.threshold:
+            return None
+        # The response row may have been pruned or cleared independently
+        response = self.store.get(self._response_key(namespace, topics[best]))
+        if response is None:
+            return None
+        return response, topics[best], score
+
+    def set(self, namespace: str, embedding: Sequence[float], topic: str, response: str) -> None:
+        """
+        Store a response and persist the embeddings.
+
+        Args:
+            namespace: Request kind the response belongs to
+            embedding: Embedding of the request's topic
+            topic: Topic text (kept for reporting hits)
+            response: Response text
+        """
+        self.store.set(self._response_key(namespace, topic), response)
+        vector = self._normalize(embedding).reshape(1, -1)
+        expires_at = np.array([time.time() + self.store.default_ttl])
+        entry = self._entries.get(namespace)
+        if entry and entry[0].shape[1] == vector.shape[1]:
+            vectors, topics, expires = entry
+            # Keep one row per topic and at most max_entries rows, dropping the oldest
+            keep = np.array([t != topic for t in topics], dtype=bool)
+            overflow = int(keep.sum()) + 1 - self.max_entries
+            if overflow > 0:
+                keep[np.flatnonzero(keep)[:overflow]] = False
+            if keep.all():
+                self._entries[namespace] = (np.vstack([vectors, vector]), topics + [topic], np.concatenate([expires, expires_at]))
+                # Extend a built index in place rather than re-adding every vector on the next lookup
+                index = self._indexes.get(namespace)
+                if index is not None:
+                    index.add(vector)
+            else:
+                self._entries[namespace] = (
+                    np.vstack([vectors[keep], vector]),
+                    [t for t, kept in zip(topics, keep) if kept] + [topic],
+                    np.concatenate([expires[keep], expires_at]),
+                )
+                self._indexes.pop(namespace, None)
+        else:
+            self._entries[namespace] = (vector, [topic], expires_at)
+            self._indexes.pop(namespace, None)
+        self._save()
+
+    def clear(self) -> None:
+        """Remove every cached embedding (the responses are cleared with the response cache)."""
+        self._entries.clear()
+        self._indexes.clear()
+        self._save()
+
+    def _load(self) -> None:
+        """Read the embeddings saved by _save (plain arrays and JSON only, never pickles)."""
+        with np.load(self.path, allow_pickle=False) as data:
+            namespaces = json.loads(str(data["index"]))
+            for i, (namespace, topics) in enumerate(namespaces):
+                self._entries[namespace] = (data[f"vectors_{i}"], topics, data[f"expires_{i}"])
+
+    def _save(self) -> None:
+        """Write the embeddings to disk through a temp file so a crash never truncates it."""
+        arrays = {}
+        namespaces = []
+        for i, (namespace, (vectors, topics, expires)) in enumerate(self._entries.items()):
+            namespaces.append([namespace, topics])
+            arrays[f"vectors_{i}"] = vectors
+            arrays[f"expires_{i}"] = expires
+        # The namespace and topic strings go in as a JSON string array so loading needs no pickle
+        arrays["index"] = np.array(json.dumps(namespaces, ensure_ascii=False))
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, self.path)
@@ -1,14 +1,39 @@
 #!/usr/bin/env python3
 
 import os
+import asyncio
+import json
 import requests
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dotenv import load_dotenv
 
+# httpx (installed with the openai SDK) provides non-blocking requests for search_async
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# orjson decodes the search response bodies faster when installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _json_loads = json.loads
+    ORJSON_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+# Rate-limited (HTTP 429) searches are retried this many times, waiting for the
+# Retry-After header or an exponential backoff starting at one second
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 1.0
+# Longest wait honoured from a Retry-After header, in seconds
+RATE_LIMIT_MAX_WAIT = 30.0
+
 class BraveSearchError(Exception):
     """Custom exception for Brave Search API errors."""
     pass
@@ -28,19 +53,34 @@ class AbstractSearchProvider:
             List of dictionaries containing title, description, and URL
         """
         raise NotImplementedError("Subclasses must implement search()")
+    
+    async def search_async(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Asynchronous search; by default runs search() in a worker thread.
+        
+        Args:
+            query: The search query
+            limit: Maximum number of results to return
+            
+        Returns:
+            List of dictionaries containing title, description, and URL
+        """
+        return await asyncio.to_thread(self.search, query, limit)
 
 class BraveSearch(AbstractSearchProvider):
     """Implementation of Brave Search API."""
     
     BASE_URL = "https://api.search.brave.com/res/v1/web/search"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, http_client: Optional["httpx.AsyncClient"] = None):
         """
         Initialize the Brave Search API client.
         
         Args:
             api_key: Brave Search API key (if None, will try to read from environment)
+            http_client: Pooled httpx.AsyncClient for search_async (if None, each search opens its own)
         """
+        self.http_client = http_client
         self.api_key = api_key or os.getenv("BRAVE_API_KEY")
         if not self.api_key:
             raise BraveSearchError("Brave Search API key not found. Please set BRAVE_API_KEY in your .env file.")
@@ -57,58 +97,114 @@ class BraveSearch(AbstractSearchProvider):
             List of dictionaries containing title, description, and URL
         """
         try:
-            headers = {
-                "X-Subscription-Token": self.api_key,
-                "Accept": "application/json",
-            }
-            
-            params = {
-                "q": query,
-                "count": min(limit, 20),  # Brave API limit is 20 per request
-            }
+            headers, params = self._build_request(query, limit)
             
-            response = requests.get(
-                self.BASE_URL,
-                headers=headers,
-                params=params,
-                timeout=10
-            )
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                response = requests.get(
+                    self.BASE_URL,
+                    headers=headers,
+                    params=params,
+                    timeout=10
+                )
+                if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                    break
+                time.sleep(self._rate_limit_delay(response, attempt))
             
             if response.status_code != 200:
                 raise BraveSearchError(f"Brave Search API returned status code: {response.status_code}, response: {response.text}")
             
-            data = response.json()
+            return self._parse_results(_json_loads(response.content), limit)
+            
+        except requests.RequestException as e:
+            raise BraveSearchError(f"Error making request to Brave Search API: {str(e)}")
+        except (KeyError, ValueError) as e:
+            raise BraveSearchError(f"Error parsing Brave Search API response: {str(e)}")
+    
+    async def search_async(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Search using Brave Search API without blocking the event loop.
+        
+        Args:
+            query: The search query
+            limit: Maximum number of results to return
+            
+        Returns:
+            List of dictionaries containing title, description, and URL
+        """
+        if not HTTPX_AVAILABLE:
+            return await super().search_async(query, limit)
+        
+        try:
+            headers, params = self._build_request(query, limit)
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                if self.http_client is not None:
+                    response = await self.http_client.get(self.BASE_URL, headers=headers, params=params, timeout=10)
+                else:
+                    async with httpx.AsyncClient(timeout=10) as client:
+                        response = await client.get(self.BASE_URL, headers=headers, params=params)
+                if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                    break
+                await asyncio.sleep(self._rate_limit_delay(response, attempt))
             
-            # Parse the results
-            results = []
-            if "web" in data and "results" in data["web"]:
-                for result in data["web"]["results"][:limit]:
-                    results.append({
-                        "title": result.get("title", ""),
-                        "description": result.get("description", ""),
-                        "url": result.get("url", "")
-                    })
+            if response.status_code != 200:
+                raise BraveSearchError(f"Brave Search API returned status code: {response.status_code}, response: {response.text}")
             
-            return results
+            return self._parse_results(_json_loads(response.content), limit)
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             raise BraveSearchError(f"Error making request to Brave Search API: {str(e)}")
         except (KeyError, ValueError) as e:
             raise BraveSearchError(f"Error parsing Brave Search API response: {str(e)}")
+    
+    @staticmethod
+    def _rate_limit_delay(response, attempt: int) -> float:
+        """Return how long to wait before retrying a rate-limited request."""
+        try:
+            return min(max(float(response.headers.get("Retry-After", "")), 0.0), RATE_LIMIT_MAX_WAIT)
+        except ValueError:
+            return RATE_LIMIT_BACKOFF * 2 ** attempt
+    
+    def _build_request(self, query: str, limit: int) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Return the headers and query parameters for a search request."""
+        headers = {
+            "X-Subscription-Token": self.api_key,
+            "Accept": "application/json",
+        }
+        
+        params = {
+            "q": query,
+            "count": min(limit, 20),  # Brave API limit is 20 per request
+        }
+        return headers, params
+    
+    @staticmethod
+    def _parse_results(data: Dict[str, Any], limit: int) -> List[Dict[str, str]]:
+        """Extract title, description and URL from a Brave Search response body."""
+        results = []
+        if "web" in data and "results" in data["web"]:
+            for result in data["web"]["results"][:limit]:
+                results.append({
+                    "title": result.get("title", ""),
+                    "description": result.get("description", ""),
+                    "url": result.get("url", "")
+                })
+        
+        return results
 
-def get_search_provider(provider_name: str = "brave") -> AbstractSearchProvider:
+def get_search_provider(provider_name: str = "brave", http_client: Optional["httpx.AsyncClient"] = None) -> AbstractSearchProvider:
     """
     Factory function to get the appropriate search provider.
     This allows for easy extension to other search providers in the future.
     
     Args:
         provider_name: Name of the search provider ("brave" for now)
+        http_client: Pooled httpx.AsyncClient for asynchronous searches, if any
         
     Returns:
         An instance of a search provider
     """
     if provider_name.lower() == "brave":
-        return BraveSearch()
+        return BraveSearch(http_client=http_client)
     else:
         raise ValueError(f"Unknown search provider: {provider_name}")
 
@@ -125,12 +221,10 @@ def format_search_results_for_prompt(results: List[Dict[str, str]]) -> str:
     if not results:
         return "No web search results found."
     
-    output = "Based on the following web search results:\n\n"
-    
-    for i, result in enumerate(results, 1):
-        output += f"{i}. [{result['title']}] - {result['description']} ({result['url']})\n\n"
-    
-    output += "Generate a comprehensive, professional market research report using ONLY the information from these sources.\n"
-    output += "Please ensure all information is factual and based on these search results. Do not hallucinate or include information not found in these sources.\n"
+    lines = ["Based on the following web search results:\n\n"]
+    lines.extend(f"{i}. [{result['title']}] - {result['description']} ({result['url']})\n\n"
+                 for i, result in enumerate(results, 1))
+    lines.append("Generate a comprehensive, professional market research report using ONLY the information from these sources.\n")
+    lines.append("Please ensure all information is factual and based on these search results. Do not hallucinate or include information not found in these sources.\n")
     
-    return output 
\ No newline at end of file
+    return "".join(lines)
\ No newline at end of file
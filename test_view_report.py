@@ -1,23 +1,9 @@
 #!/usr/bin/env python3
-import re
 from pathlib import Path
 import sys
 
-def clean_escape_sequences(content):
-    """Enhanced cleaning of ANSI escape sequences"""
-    # First, handle text representations of ESC
-    esc_pattern = re.compile(r'ESC\[(\d+;)*\d*[a-zA-Z]|ESC\[\d+m|ESC\[0m|ESC\[1m|ESC\[4m|ESC\[\d+;\d+m')
-    content = esc_pattern.sub('', content)
-    
-    # Then handle actual ANSI escape sequences
-    ansi_pattern = re.compile(r'\x1B\[(\d+;)*\d*[a-zA-Z]|\x1B\[\d+m|\x1B\[0m|\x1B\[1m|\x1B\[4m|\x1B\[\d+;\d+m')
-    content = ansi_pattern.sub('', content)
-    
-    # More comprehensive pattern for any remaining escapes
-    full_pattern = re.compile(r'(?:\x1B|\bESC)(?:\[|\(|\))[^@-Z\\^_`a-z{|}~]*[@-Z\\^_`a-z{|}~]')
-    content = full_pattern.sub('', content)
-    
-    return content
+# Reuse the cleaner from fix_report so its pattern is compiled once at import
+from fix_report import clean_escape_sequences
 
 def view_report(report_path):
     """View a report with enhanced ANSI escape sequence cleaning"""
@@ -0,0 +1,22 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# fast_cli is run as a script from market_research_cli/, so its sibling packages import top-level
+sys.path.insert(0, str(ROOT / "market_research_cli"))
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session")
+def fast_cli(tmp_path_factory):
+    """Import fast_cli from a scratch directory so its reports/ and .env paths stay out of the repo."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("cli"))
+    try:
+        import fast_cli
+    finally:
+        os.chdir(cwd)
+    return fast_cli
@@ -0,0 +1,36 @@
+import os
+
+
+def test_update_env_vars_rewrites_in_place(fast_cli, tmp_path, monkeypatch):
+    for key in ("BRAVE_API_KEY", "OPENAI_MODEL", "WEB_SEARCH_CONCURRENCY"):
+        monkeypatch.delenv(key, raising=False)
+    env_path = tmp_path / ".env"
+    env_path.write_text(
+        "# API keys\n"
+        "BRAVE_API_KEY=old\n"
+        "\n"
+        "OPENAI_MODEL=gpt-4o-mini"  # no trailing newline
+    )
+
+    fast_cli._update_env_vars({"BRAVE_API_KEY": "new", "WEB_SEARCH_CONCURRENCY": "2"}, env_path)
+
+    assert env_path.read_text() == (
+        "# API keys\n"
+        "BRAVE_API_KEY=new\n"
+        "\n"
+        "OPENAI_MODEL=gpt-4o-mini\n"
+        "WEB_SEARCH_CONCURRENCY=2\n"
+    )
+    assert os.environ["BRAVE_API_KEY"] == "new"
+    assert os.environ["WEB_SEARCH_CONCURRENCY"] == "2"
+    assert "OPENAI_MODEL" not in os.environ
+    assert [p.name for p in tmp_path.iterdir()] == [".env"]
+
+
+def test_update_env_vars_creates_missing_file(fast_cli, tmp_path, monkeypatch):
+    monkeypatch.delenv("BRAVE_API_KEY", raising=False)
+    env_path = tmp_path / ".env"
+
+    fast_cli._update_env_vars({"BRAVE_API_KEY": "key"}, env_path)
+
+    assert env_path.read_text() == "BRAVE_API_KEY=key\n"
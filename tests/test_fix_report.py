@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+import fix_report
+from fix_report import _clean_file_streaming, clean_escape_sequences
+
+# Enough escape fragments that block boundaries land inside sequences, "ESC" text
+# and parameter runs
+ALPHABET = [b'\x1b', b'[', b'(', b'ESC', b'1', b';', b'm', b' ', b'a', b'E', b'S', b'C', b'\n', b'9']
+
+
+def _stream(tmp_path, data):
+    path = tmp_path / "report.md"
+    path.write_bytes(data)
+    changed = _clean_file_streaming(path)
+    return path.read_bytes(), changed
+
+
+@pytest.mark.parametrize("chunk_size", [7, 37])
+def test_streaming_matches_whole_file_cleaning(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(fix_report, "_CHUNK_SIZE", chunk_size)
+    rng = random.Random(1)
+    for _ in range(3000):
+        data = b''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 300)))
+        expected = clean_escape_sequences(data)
+        cleaned, changed = _stream(tmp_path, data)
+        assert cleaned == expected, data
+        assert changed == (expected != data)
+
+
+def test_sequence_longer_than_a_block(tmp_path, monkeypatch):
+    monkeypatch.setattr(fix_report, "_CHUNK_SIZE", 16)
+    data = b'hello \x1b[' + b'1;' * 60 + b'm world'
+    assert _stream(tmp_path, data) == (b'hello  world', True)
+    assert clean_escape_sequences(data) == b'hello  world'
+
+
+def test_clean_file_left_untouched(tmp_path, monkeypatch):
+    monkeypatch.setattr(fix_report, "_CHUNK_SIZE", 8)
+    data = b'plain ESCAPE text, nothing to strip\n' * 4
+    assert _stream(tmp_path, data) == (data, False)
+    assert not (tmp_path / "report.md.tmp").exists()
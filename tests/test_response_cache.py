@@ -0,0 +1,57 @@
+import time
+
+from response_cache import ResponseCache, make_cache_key
+
+
+def test_set_get_round_trip(tmp_path):
+    cache = ResponseCache(tmp_path)
+    key = make_cache_key(model="gpt-4o", topic="EV batteries")
+    assert cache.get(key) is None
+    cache.set(key, "report text")
+    assert cache.get(key) == "report text"
+    # Entries survive reopening the database
+    assert ResponseCache(tmp_path).get(key) == "report text"
+
+
+def test_expired_entries_miss_and_are_pruned(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.set("stale", "old", expire=-1)
+    cache.set("fresh", "new")
+    assert cache.get("stale") is None
+    assert cache.prune() == 1
+    assert cache.get("fresh") == "new"
+
+
+def test_default_ttl_applies(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, default_ttl=10)
+    cache.set("key", "value")
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("key") is None
+
+
+def test_clear(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.set("key", "value")
+    cache.clear()
+    assert cache.get("key") is None
+
+
+def test_make_cache_key_ignores_argument_order():
+    assert make_cache_key(a=1, b="x") == make_cache_key(b="x", a=1)
+    assert make_cache_key(a=1, b="x") != make_cache_key(a=1, b="y")
+
+
+def test_section_key_stable_when_results_reordered(fast_cli):
+    results = [
+        {"url": "https://a.example", "title": "A", "description": "first"},
+        {"url": "https://b.example", "title": "B", "description": "second"},
+    ]
+    key = fast_cli._section_cache_key("gpt-4o", "EV batteries", "market_size", results)
+    assert key is not None
+    assert fast_cli._section_cache_key("gpt-4o", "EV batteries", "market_size", results[::-1]) == key
+    # Snippet text does not affect the key, but a different source does
+    edited = [dict(results[0], description="changed"), results[1]]
+    assert fast_cli._section_cache_key("gpt-4o", "EV batteries", "market_size", edited) == key
+    other = [results[0], {"url": "https://c.example"}]
+    assert fast_cli._section_cache_key("gpt-4o", "EV batteries", "market_size", other) != key
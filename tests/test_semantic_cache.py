@@ -0,0 +1,67 @@
+import time
+
+import numpy as np
+import pytest
+
+from response_cache import ResponseCache, SEMANTIC_CACHE_AVAILABLE, SemanticCache
+
+pytestmark = pytest.mark.skipif(not SEMANTIC_CACHE_AVAILABLE, reason="numpy not installed")
+
+
+def _unit(*values):
+    return np.asarray(values, dtype=np.float32)
+
+
+def test_set_and_lookup(tmp_path):
+    cache = SemanticCache(ResponseCache(tmp_path), threshold=0.9)
+    cache.set("gpt-4o:market_size", _unit(1, 0, 0), "EV batteries", "cached report")
+
+    response, topic, score = cache.get("gpt-4o:market_size", _unit(0.99, 0.1, 0))
+    assert (response, topic) == ("cached report", "EV batteries")
+    assert score > 0.9
+    # Too far away, another namespace, or a different embedding size all miss
+    assert cache.get("gpt-4o:market_size", _unit(0, 1, 0)) is None
+    assert cache.get("gpt-4o:competitors", _unit(1, 0, 0)) is None
+    assert cache.get("gpt-4o:market_size", _unit(1, 0)) is None
+
+
+def test_reload_from_disk(tmp_path):
+    store = ResponseCache(tmp_path)
+    SemanticCache(store).set("ns", _unit(0, 1), "solar", "report")
+    assert (tmp_path / "semantic_vectors.npz").exists()
+
+    hit = SemanticCache(store).get("ns", _unit(0, 1))
+    assert hit is not None and hit[:2] == ("report", "solar")
+
+
+def test_entries_expire(tmp_path, monkeypatch):
+    store = ResponseCache(tmp_path, default_ttl=10)
+    cache = SemanticCache(store)
+    cache.set("ns", _unit(1, 0), "solar", "report")
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+
+    # Expired rows are dropped when the cache is loaded and again on lookup
+    assert SemanticCache(store)._entries == {}
+    assert cache.get("ns", _unit(1, 0)) is None
+    assert "ns" not in cache._entries
+
+
+def test_max_entries_drops_oldest(tmp_path):
+    cache = SemanticCache(ResponseCache(tmp_path), max_entries=2)
+    cache.set("ns", _unit(1, 0, 0), "first", "one")
+    cache.set("ns", _unit(0, 1, 0), "second", "two")
+    cache.set("ns", _unit(0, 0, 1), "third", "three")
+
+    assert cache._entries["ns"][1] == ["second", "third"]
+    assert cache.get("ns", _unit(1, 0, 0)) is None
+    assert cache.get("ns", _unit(0, 0, 1))[0] == "three"
+
+
+def test_same_topic_replaces_entry(tmp_path):
+    cache = SemanticCache(ResponseCache(tmp_path))
+    cache.set("ns", _unit(1, 0), "solar", "old")
+    cache.set("ns", _unit(1, 0), "solar", "new")
+
+    assert cache._entries["ns"][1] == ["solar"]
+    assert cache.get("ns", _unit(1, 0))[0] == "new"